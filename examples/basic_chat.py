@@ -8,12 +8,8 @@ Demonstrates simple chat interaction with CURC-hosted LLM server.
 """
 
 import sys
-import os
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-from src.client.curc_llm_client import CURCLLMClient
+from src.client import CURCLLMClient
 
 
 def main():
@@ -8,12 +8,9 @@ Provides an interactive command-line chat interface for CURC-hosted LLM.
 """
 
 import sys
-import os
+import time
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-from src.client.curc_llm_client import CURCLLMClient
+from src.client import CURCLLMClient
 
 
 def main():
@@ -56,9 +53,11 @@ def main():
     print("=" * 50)
     print()
     
-    # Conversation history
-    conversation = []
+    # Conversation history. The list is only ever appended to (system
+    # prompt first), so each turn's request shares the previous turn's
+    # exact prefix and hits the server's prefix cache.
     system_prompt = "You are a helpful AI assistant."
+    messages = [{"role": "system", "content": system_prompt}]
     
     # Resolve model name once up front
     model_name = client._get_default_model()
@@ -81,7 +80,7 @@ def main():
                     break
                 
                 elif command == '/clear':
-                    conversation = []
+                    messages = [{"role": "system", "content": system_prompt}]
                     print("Conversation cleared.")
                     continue
                 
@@ -99,15 +98,11 @@ def main():
                     continue
             
             # Add to conversation history
-            conversation.append({"role": "user", "content": user_input})
+            messages.append({"role": "user", "content": user_input})
             
             # Get response
             print("Assistant: ", end="", flush=True)
             
-            # Build messages with history
-            messages = [{"role": "system", "content": system_prompt}]
-            messages.extend(conversation)
-            
             # Stream response
             full_response = ""
             stream = client.openai_client.chat.completions.create(
@@ -118,17 +113,28 @@ def main():
                 stream=True
             )
             
+            # Buffer chunks and flush at most every ~16 ms (or on newline)
+            # instead of issuing a write syscall per token
+            buf = []
+            last_flush = time.monotonic()
             for chunk in stream:
                 if chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
-                    print(content, end="", flush=True)
+                    buf.append(content)
                     full_response += content
+                    if "\n" in content or time.monotonic() - last_flush > 0.016:
+                        sys.stdout.write("".join(buf))
+                        sys.stdout.flush()
+                        buf.clear()
+                        last_flush = time.monotonic()
             
+            sys.stdout.write("".join(buf))
+            sys.stdout.flush()
             print()  # Newline after response
             print()
             
             # Add assistant response to history
-            conversation.append({"role": "assistant", "content": full_response})
+            messages.append({"role": "assistant", "content": full_response})
             
         except KeyboardInterrupt:
             print()
@@ -8,12 +8,9 @@ Demonstrates streaming responses from CURC-hosted LLM server.
 """
 
 import sys
-import os
+import time
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-from src.client.curc_llm_client import CURCLLMClient
+from src.client import CURCLLMClient
 
 
 def main():
@@ -43,14 +40,25 @@ def main():
     print("Assistant: ", end="", flush=True)
     
     try:
+        # Buffer chunks and flush at most every ~16 ms (or on newline)
+        # instead of issuing a write syscall per token
+        buf = []
+        last_flush = time.monotonic()
         for chunk in client.chat_stream(
             message=message,
             system_prompt="You are a creative AI assistant.",
             temperature=0.8,
             max_tokens=256
         ):
-            print(chunk, end="", flush=True)
+            buf.append(chunk)
+            if "\n" in chunk or time.monotonic() - last_flush > 0.016:
+                sys.stdout.write("".join(buf))
+                sys.stdout.flush()
+                buf.clear()
+                last_flush = time.monotonic()
         
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
         print()  # Newline after stream completes
         print()
         print("=" * 50)
@@ -9,42 +9,272 @@ Benchmarks throughput, latency, and concurrency for vLLM deployments.
 
 import argparse
 import asyncio
-import json
+import hashlib
+import itertools
+import math
+import aiohttp
+import orjson
 import time
-import statistics
-from typing import List, Dict, Any
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import sys
 import os
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.client import CURCLLMClient
 
-from src.client.curc_llm_client import CURCLLMClient
+try:
+    from tdigest import TDigest
+except ImportError:  # Optional: streaming percentiles for long runs
+    TDigest = None
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # Optional: exact counts when the server omits usage
+    Tokenizer = None
+
+try:
+    import uvloop
+except ImportError:  # Optional: faster libuv-based event loop (POSIX only)
+    uvloop = None
+
+
+# Long, constant system prompt shared by every benchmark request. With
+# vLLM's --enable-prefix-caching, all requests after the first reuse its
+# KV cache, so results reflect steady-state serving rather than cold prefill.
+SHARED_SYSTEM = (
+    "You are a benchmarking assistant for a research computing cluster. "
+    "Answer clearly and concisely, stay on topic, and avoid repeating the "
+    "question back to the user. "
+) * 40
+
+# Word list used to synthesize prompts for the "random" dataset
+RANDOM_VOCAB = (
+    "the model data compute node cluster memory token batch request server "
+    "latency research science energy network system result value graph "
+    "signal matrix vector kernel stream cache layer weight input output "
+    "time space field theory method process state change order level"
+).split()
+
+# Default HuggingFace dataset for the "hf" dataset (MLPerf Llama 2 prompts)
+DEFAULT_HF_DATASET = "mgoin/mlperf-inference-llama2-data"
+
+# Default sampling temperature for benchmark requests
+TEMPERATURE = 0.7
+
+# Maximum number of responses kept by the optional response cache
+CACHE_MAX_SIZE = 4096
+
+# Usage-less responses handed to the tokenizer thread once this many are
+# pending, so long runs do not buffer every response text until the end
+TOKENIZE_BATCH_SIZE = 256
+
+# Maximum number of distinct response texts whose token counts are memoized
+TOKEN_COUNT_CACHE_SIZE = 4096
+
+# Rough characters per token, used to size requests when no tokenizer loads
+CHARS_PER_TOKEN = 4
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def build_workload(
+    dataset_name: str = "random",
+    num_prompts: int = 1000,
+    input_len: int = 256,
+    output_len: int = 128,
+    range_ratio: float = 0.0,
+    hf_dataset: str = DEFAULT_HF_DATASET,
+    hf_split: str = "train",
+    hf_field: str = "question",
+    seed: int = 0,
+    tokenizer: Optional[Any] = None
+) -> List[Tuple[str, int]]:
+    """
+    Pre-generate a list of (prompt, max_tokens) pairs for the benchmarks.
+    
+    Prompt lengths cover the user message only. PerformanceBenchmark also
+    sends SHARED_SYSTEM (over a thousand tokens) with every request unless
+    ``shared_prefix`` is False, so prefix + prompt + max_tokens must fit the
+    server's max_model_len (see PerformanceBenchmark.check_workload).
+    
+    Args:
+        dataset_name: "random" for synthetic prompts or "hf" for a
+            HuggingFace dataset
+        num_prompts: Number of pairs to generate
+        input_len: Mean prompt length in tokens (random dataset); measured
+            with ``tokenizer`` when given, otherwise approximated as one
+            token per RANDOM_VOCAB word
+        output_len: Mean max_tokens per request
+        range_ratio: Lengths are drawn uniformly from
+            [(1 - r) * len, (1 + r) * len]
+        hf_dataset: HuggingFace dataset name (hf dataset)
+        hf_split: Dataset split to load (hf dataset)
+        hf_field: Column holding the prompt text (hf dataset)
+        seed: Random seed for reproducible workloads
+        tokenizer: Optional ``tokenizers.Tokenizer`` used to trim random
+            prompts to an exact token length
+        
+    Returns:
+        List of (prompt, max_tokens) pairs
+    """
+    rng = np.random.default_rng(seed)
+    
+    def draw_lengths(mean_len: int) -> np.ndarray:
+        low = max(1, int((1 - range_ratio) * mean_len))
+        high = max(low, int((1 + range_ratio) * mean_len))
+        return rng.integers(low, high, size=num_prompts, endpoint=True)
+    
+    output_lens = draw_lengths(output_len)
+    
+    if dataset_name == "random":
+        input_lens = draw_lengths(input_len)
+        prompts = [
+            " ".join(rng.choice(RANDOM_VOCAB, size=length))
+            for length in input_lens
+        ]
+        if tokenizer is not None:
+            # Every word is at least one token, so trimming hits the length
+            encodings = tokenizer.encode_batch(prompts, add_special_tokens=False)
+            prompts = [
+                tokenizer.decode(encoding.ids[:length])
+                for encoding, length in zip(encodings, input_lens)
+            ]
+    elif dataset_name == "hf":
+        from datasets import load_dataset
+        
+        dataset = load_dataset(hf_dataset, split=hf_split)
+        texts = dataset[hf_field]
+        prompts = [texts[i % len(texts)] for i in range(num_prompts)]
+    else:
+        raise ValueError(f"Unknown dataset: {dataset_name}")
+    
+    return [(prompt, int(length)) for prompt, length in zip(prompts, output_lens)]
+
+
+class RunningStats:
+    """
+    Constant-memory latency statistics for long-running benchmarks.
+    
+    Mean and variance use Welford's online algorithm. Percentiles come from
+    a t-digest when the optional ``tdigest`` package is installed.
+    """
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._digest = TDigest() if TDigest is not None else None
+    
+    def update(self, value: float) -> None:
+        """Add one sample."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self._digest is not None:
+            self._digest.update(value)
+    
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation (0 for fewer than two samples)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+    
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Approximate percentile, or None without samples or ``tdigest``."""
+        if self._digest is None or self.count == 0:
+            return None
+        return float(self._digest.percentile(percentile))
 
 
 class PerformanceBenchmark:
     """Performance benchmarking for vLLM servers."""
     
-    def __init__(self, base_url: str = "http://localhost:8000", api_key: str = None):
-        """Initialize benchmark suite."""
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        api_key: str = None,
+        shared_prefix: bool = True,
+        enable_cache: bool = False,
+        temperature: float = TEMPERATURE,
+        model: Optional[str] = None,
+        workload: Optional[List[Tuple[str, int]]] = None
+    ):
+        """
+        Initialize benchmark suite.
+        
+        Args:
+            base_url: Base URL of the vLLM server
+            api_key: Optional API key for authentication
+            shared_prefix: Send SHARED_SYSTEM with every request so the
+                server's prefix cache is exercised
+            enable_cache: Serve repeated identical requests from an
+                in-process LRU response cache (only when ``temperature`` is
+                0, since sampled outputs must not be replayed)
+            temperature: Sampling temperature sent with every request
+            model: Model name to benchmark (if None, resolved once from the
+                server's /v1/models)
+            workload: Pre-generated (prompt, max_tokens) pairs (see
+                build_workload); overrides each benchmark's fixed prompt
+        """
         self.base_url = base_url
         self.api_key = api_key
+        self.system_prompt = SHARED_SYSTEM if shared_prefix else None
+        self.enable_cache = enable_cache
+        self.temperature = temperature
+        self.model = model
+        self.workload = workload
+        self._tokenizer = None
+        self._tokenizer_failed = False
+        # Token counts per response text, so repeated outputs encode once
+        self._token_counts: Dict[str, int] = {}
+        # Serialized request bodies keyed by (model, prompt, max_tokens)
+        self._payloads: Dict[tuple, bytes] = {}
+        # Responses without a usage block, tokenized in bounded batches
+        self._untokenized: List[str] = []
+        # Counts for batches flushed to the tokenizer thread during this run
+        self._token_futures: List[asyncio.Future] = []
+        # One worker keeps encoding off the event loop and serializes access
+        # to _token_counts
+        self._tokenize_executor = ThreadPoolExecutor(max_workers=1)
         self.results = {}
+        self._response_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # One client (and connection pool) shared by every benchmark
+        self.client = CURCLLMClient(base_url=base_url, api_key=api_key)
     
-    def benchmark_latency(
+    async def benchmark_latency_async(
         self,
         num_requests: int = 100,
         prompt: str = "Write a short paragraph about artificial intelligence.",
-        max_tokens: int = 100
+        max_tokens: int = 100,
+        warmup: int = 3,
+        pipeline_depth: int = 1
     ) -> Dict[str, float]:
         """
-        Benchmark single-request latency.
+        Benchmark request latency (async version).
+        
+        With ``pipeline_depth`` of 1 requests are strictly sequential
+        (single-stream latency); higher depths keep that many requests in
+        flight so latency is measured while the server's batcher is busy.
         
         Args:
-            num_requests: Number of sequential requests
+            num_requests: Number of timed requests
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
+            warmup: Untimed requests sent first to absorb server startup cost
+            pipeline_depth: Maximum number of requests in flight
             
         Returns:
             Dictionary of latency statistics
@@ -53,39 +283,61 @@ class PerformanceBenchmark:
         print("LATENCY BENCHMARK")
         print(f"{'='*60}")
         print(f"Requests: {num_requests}")
+        print(f"Pipeline depth: {pipeline_depth}")
         print(f"Max tokens: {max_tokens}")
         print(f"Prompt length: {len(prompt.split())} words\n")
         
-        client = CURCLLMClient(base_url=self.base_url, api_key=self.api_key)
-        latencies = []
+        url = f"{self.client.base_url}/v1/chat/completions"
+        model = self._resolve_model()
+        # Load up front so deferred token counting never downloads mid-run
+        self._load_tokenizer(model)
         
-        for i in range(num_requests):
-            start_time = time.time()
-            try:
-                response = client.chat(prompt, max_tokens=max_tokens)
-                latency = time.time() - start_time
-                latencies.append(latency)
-                
-                if (i + 1) % 10 == 0:
-                    print(f"  Progress: {i+1}/{num_requests} requests")
+        semaphore = asyncio.Semaphore(pipeline_depth)
+        completed = 0
+        
+        async def timed_request(index):
+            nonlocal completed
+            request_prompt, request_max_tokens = self._request_params(
+                index, prompt, max_tokens
+            )
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    await self._post_chat(
+                        session, url, model, request_prompt, request_max_tokens
+                    )
+                    latency = time.perf_counter() - start_time
+                except Exception as e:
+                    print(f"  Error on request {index+1}: {e}")
+                    return None
             
-            except Exception as e:
-                print(f"  Error on request {i+1}: {e}")
+            completed += 1
+            if completed % 10 == 0:
+                print(f"  Progress: {completed}/{num_requests} requests")
+            return latency
+        
+        async with self._create_session(pipeline_depth) as session:
+            await self._warmup(session, url, model, prompt, max_tokens, warmup)
+            self._reset_cache_stats()
+            self._reset_deferred_tokens()
+            
+            results_list = await asyncio.gather(
+                *(timed_request(i) for i in range(num_requests))
+            )
+        
+        latencies = [latency for latency in results_list if latency is not None]
         
         if not latencies:
             return {"error": "No successful requests"}
         
-        results = {
-            "mean_latency_s": statistics.mean(latencies),
-            "median_latency_s": statistics.median(latencies),
-            "p95_latency_s": self._percentile(latencies, 95),
-            "p99_latency_s": self._percentile(latencies, 99),
-            "min_latency_s": min(latencies),
-            "max_latency_s": max(latencies),
-            "std_dev_s": statistics.stdev(latencies) if len(latencies) > 1 else 0,
+        results = self._latency_stats(latencies)
+        results.update({
             "successful_requests": len(latencies),
-            "failed_requests": num_requests - len(latencies)
-        }
+            "failed_requests": num_requests - len(latencies),
+            "pipeline_depth": pipeline_depth
+        })
+        if self.enable_cache:
+            results.update(self._cache_stats())
         
         print(f"\nResults:")
         print(f"  Mean latency: {results['mean_latency_s']:.3f}s")
@@ -96,19 +348,44 @@ class PerformanceBenchmark:
         
         return results
     
-    def benchmark_throughput(
+    def benchmark_latency(
+        self,
+        num_requests: int = 100,
+        prompt: str = "Write a short paragraph about artificial intelligence.",
+        max_tokens: int = 100,
+        warmup: int = 3,
+        pipeline_depth: int = 1
+    ) -> Dict[str, float]:
+        """Synchronous wrapper for latency benchmark (see benchmark_latency_async)."""
+        return run_async(self.benchmark_latency_async(
+            num_requests=num_requests,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            warmup=warmup,
+            pipeline_depth=pipeline_depth
+        ))
+    
+    async def benchmark_throughput_async(
         self,
         duration_seconds: int = 60,
         prompt: str = "Explain the concept of machine learning.",
-        max_tokens: int = 100
+        max_tokens: int = 100,
+        concurrency: int = 32,
+        warmup: int = 3
     ) -> Dict[str, float]:
         """
-        Benchmark sustained throughput.
+        Benchmark sustained throughput (async version).
+        
+        Keeps ``concurrency`` requests in flight for the whole run so the
+        server's continuous batching sees a full batch rather than a single
+        sequential stream.
         
         Args:
             duration_seconds: How long to run the benchmark
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
+            concurrency: Number of concurrent request workers
+            warmup: Untimed requests sent first to absorb server startup cost
             
         Returns:
             Dictionary of throughput statistics
@@ -117,35 +394,72 @@ class PerformanceBenchmark:
         print("THROUGHPUT BENCHMARK")
         print(f"{'='*60}")
         print(f"Duration: {duration_seconds} seconds")
+        print(f"Concurrent workers: {concurrency}")
         print(f"Max tokens: {max_tokens}\n")
         
-        client = CURCLLMClient(base_url=self.base_url, api_key=self.api_key)
-        
-        start_time = time.time()
-        end_time = start_time + duration_seconds
+        url = f"{self.client.base_url}/v1/chat/completions"
+        model = self._resolve_model()
+        # Load up front so deferred token counting never downloads mid-run
+        self._load_tokenizer(model)
         
         request_count = 0
         total_tokens = 0
         errors = 0
+        latency_stats = RunningStats()
+        request_ids = itertools.count()
         
-        print("Running...")
-        while time.time() < end_time:
-            try:
-                response = client.chat(prompt, max_tokens=max_tokens)
-                request_count += 1
-                # Approximate tokens (actual count would require tokenizer)
-                total_tokens += len(response.split())
-                
-                if request_count % 10 == 0:
-                    elapsed = time.time() - start_time
+        async with self._create_session(concurrency) as session:
+            await self._warmup(session, url, model, prompt, max_tokens, warmup)
+            self._reset_cache_stats()
+            self._reset_deferred_tokens()
+            
+            # Monotonic integer clock: immune to NTP adjustments mid-run and
+            # free of float rounding when subtracting large timestamps
+            start_ns = time.perf_counter_ns()
+            end_ns = start_ns + int(duration_seconds * 1e9)
+            
+            async def worker():
+                nonlocal request_count, total_tokens, errors
+                while time.perf_counter_ns() < end_ns:
+                    request_prompt, request_max_tokens = self._request_params(
+                        next(request_ids), prompt, max_tokens
+                    )
+                    request_start_ns = time.perf_counter_ns()
+                    try:
+                        # Await into a local first: ``total_tokens += await ...``
+                        # reads the total before suspending and would drop
+                        # other workers' updates
+                        tokens = await self._post_chat(
+                            session, url, model, request_prompt, request_max_tokens
+                        )
+                        total_tokens += tokens
+                        latency_stats.update(
+                            (time.perf_counter_ns() - request_start_ns) / 1e9
+                        )
+                        request_count += 1
+                    
+                    except Exception as e:
+                        errors += 1
+                        if errors < 5:  # Only print first few errors
+                            print(f"  Error: {e}")
+            
+            async def reporter():
+                # Progress is printed off the request path, once per second
+                while True:
+                    await asyncio.sleep(1)
+                    elapsed = (time.perf_counter_ns() - start_ns) / 1e9
                     print(f"  {request_count} requests in {elapsed:.1f}s")
             
-            except Exception as e:
-                errors += 1
-                if errors < 5:  # Only print first few errors
-                    print(f"  Error: {e}")
+            print("Running...")
+            progress = asyncio.create_task(reporter())
+            try:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            finally:
+                progress.cancel()
+            
+            actual_duration = (time.perf_counter_ns() - start_ns) / 1e9
         
-        actual_duration = time.time() - start_time
+        total_tokens += await self._drain_deferred_tokens(model)
         
         results = {
             "duration_s": actual_duration,
@@ -154,8 +468,19 @@ class PerformanceBenchmark:
             "requests_per_second": request_count / actual_duration,
             "tokens_per_second": total_tokens / actual_duration,
             "errors": errors,
-            "avg_tokens_per_request": total_tokens / request_count if request_count > 0 else 0
+            "avg_tokens_per_request": total_tokens / request_count if request_count > 0 else 0,
+            "mean_latency_s": latency_stats.mean,
+            "std_dev_s": latency_stats.std_dev,
+            "concurrency": concurrency
         }
+        if latency_stats.percentile(50) is not None:
+            results.update({
+                "median_latency_s": latency_stats.percentile(50),
+                "p95_latency_s": latency_stats.percentile(95),
+                "p99_latency_s": latency_stats.percentile(99)
+            })
+        if self.enable_cache:
+            results.update(self._cache_stats())
         
         print(f"\nResults:")
         print(f"  Total requests: {results['total_requests']}")
@@ -166,34 +491,322 @@ class PerformanceBenchmark:
         
         return results
     
+    def benchmark_throughput(
+        self,
+        duration_seconds: int = 60,
+        prompt: str = "Explain the concept of machine learning.",
+        max_tokens: int = 100,
+        concurrency: int = 32,
+        warmup: int = 3
+    ) -> Dict[str, float]:
+        """Synchronous wrapper for throughput benchmark (see benchmark_throughput_async)."""
+        return run_async(self.benchmark_throughput_async(
+            duration_seconds=duration_seconds,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            concurrency=concurrency,
+            warmup=warmup
+        ))
+    
+    def _request_params(
+        self,
+        index: int,
+        prompt: str,
+        max_tokens: int
+    ) -> Tuple[str, int]:
+        """Return (prompt, max_tokens) for a request, cycling the workload if set."""
+        if not self.workload:
+            return prompt, max_tokens
+        return self.workload[index % len(self.workload)]
+    
+    def _resolve_model(self) -> str:
+        """Return the benchmark model, looking it up on the server only once."""
+        if self.model is None:
+            self.model = self.client._get_default_model()
+        return self.model
+    
+    def _cache_key(self, model: str, prompt: str, max_tokens: int) -> tuple:
+        """Build a response cache key from the request parameters."""
+        digest = hashlib.blake2b(
+            f"{self.system_prompt or ''}\0{prompt}".encode(),
+            digest_size=16
+        ).hexdigest()
+        return (model, self.temperature, max_tokens, digest)
+    
+    def _cache_lookup(self, key: tuple) -> Optional[Any]:
+        """Return a cached response (or None), recording the hit or miss."""
+        value = self._response_cache.get(key)
+        if value is None:
+            self._cache_misses += 1
+        else:
+            self._cache_hits += 1
+            self._response_cache.move_to_end(key)
+        return value
+    
+    def _cache_store(self, key: tuple, value: Any) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        self._response_cache[key] = value
+        if len(self._response_cache) > CACHE_MAX_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def _reset_cache_stats(self) -> None:
+        """Reset hit/miss counters (cached responses are kept)."""
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def _cache_stats(self) -> Dict[str, float]:
+        """Summarize response cache effectiveness."""
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "cache_hit_rate": self._cache_hits / lookups if lookups else 0.0
+        }
+    
+    def _create_session(self, pool_size: int) -> aiohttp.ClientSession:
+        """Create an aiohttp session sized for ``pool_size`` in-flight requests."""
+        connector = aiohttp.TCPConnector(
+            limit=pool_size * 2,
+            limit_per_host=pool_size * 2,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.client._get_headers(),
+            timeout=aiohttp.ClientTimeout(total=self.client.timeout)
+        )
+    
+    def _payload(self, model: str, prompt: str, max_tokens: int) -> bytes:
+        """Return the serialized request body, building it once per prompt."""
+        key = (model, prompt, max_tokens)
+        payload = self._payloads.get(key)
+        if payload is None:
+            messages = [{"role": "user", "content": prompt}]
+            if self.system_prompt:
+                messages.insert(0, {"role": "system", "content": self.system_prompt})
+            payload = orjson.dumps({
+                "model": model,
+                "messages": messages,
+                "temperature": self.temperature,
+                "max_tokens": max_tokens
+            })
+            self._payloads[key] = payload
+        return payload
+    
+    async def _post_chat(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        model: str,
+        prompt: str,
+        max_tokens: int
+    ) -> int:
+        """POST a chat completion and return its completion token count."""
+        key = None
+        # Only greedy decoding is deterministic enough to replay
+        if self.enable_cache and self.temperature == 0:
+            key = self._cache_key(model, prompt, max_tokens)
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                # Yield anyway so a hit cannot starve the other workers
+                await asyncio.sleep(0)
+                return cached
+        
+        # The session's default headers already declare application/json
+        async with session.post(
+            url,
+            data=self._payload(model, prompt, max_tokens)
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        # vLLM reports exact counts in the usage block of every response
+        usage = data.get("usage")
+        if not usage:
+            # Count later, outside the timed section (see _count_deferred_tokens)
+            self._untokenized.append(data["choices"][0]["message"]["content"])
+            if len(self._untokenized) >= TOKENIZE_BATCH_SIZE:
+                self._flush_untokenized()
+            return 0
+        
+        tokens = usage["completion_tokens"]
+        if key is not None:
+            self._cache_store(key, tokens)
+        return tokens
+    
+    def _flush_untokenized(self) -> None:
+        """Hand the pending batch to the tokenizer thread without waiting on it."""
+        texts, self._untokenized = self._untokenized, []
+        self._token_futures.append(asyncio.get_running_loop().run_in_executor(
+            self._tokenize_executor, self._count_tokens, texts
+        ))
+    
+    def _count_deferred_tokens(self, model: str) -> int:
+        """
+        Tokenize responses that arrived without a usage block.
+        
+        Runs after the timed section on whatever is still pending (full
+        batches are already with the tokenizer thread, see
+        _flush_untokenized). Falls back to a whitespace word count if
+        ``tokenizers`` is unavailable or the model's tokenizer cannot be
+        loaded.
+        
+        Args:
+            model: Model name used to load the tokenizer
+            
+        Returns:
+            Total completion tokens across the pending responses
+        """
+        if not self._untokenized:
+            return 0
+        texts, self._untokenized = self._untokenized, []
+        self._load_tokenizer(model)
+        return self._count_tokens(texts)
+    
+    def _count_tokens(self, texts: List[str]) -> int:
+        """
+        Count completion tokens across ``texts`` with the loaded tokenizer.
+        
+        Batch-encodes each distinct text. Up to TOKEN_COUNT_CACHE_SIZE counts
+        are kept across calls, so identical responses are usually encoded
+        once. Never loads the tokenizer itself, so it is safe to run while
+        requests are being timed; without one it counts whitespace words.
+        
+        Args:
+            texts: Response texts to count
+            
+        Returns:
+            Total completion tokens across ``texts``
+        """
+        if self._tokenizer is None:
+            return sum(len(text.split()) for text in texts)
+        counts = self._token_counts
+        distinct = dict.fromkeys(texts)
+        if len(counts) + len(distinct) > TOKEN_COUNT_CACHE_SIZE:
+            counts.clear()
+        pending = [text for text in distinct if text not in counts]
+        if pending:
+            encodings = self._tokenizer.encode_batch(pending, add_special_tokens=False)
+            counts.update(zip(pending, (len(encoding.ids) for encoding in encodings)))
+        return sum(counts[text] for text in texts)
+    
+    async def _drain_deferred_tokens(self, model: str) -> int:
+        """Return every deferred token from this run, counting the remainder."""
+        futures, self._token_futures = self._token_futures, []
+        tokens = sum(await asyncio.gather(*futures))
+        return tokens + self._count_deferred_tokens(model)
+    
+    def _reset_deferred_tokens(self) -> None:
+        """Discard deferred responses and counts (e.g. from warmup requests)."""
+        self._untokenized.clear()
+        self._token_futures.clear()
+    
+    def _load_tokenizer(self, model: str) -> Optional[Any]:
+        """Return the model's Rust tokenizer, loading it on first use (None if unavailable)."""
+        if self._tokenizer is None and Tokenizer is not None and not self._tokenizer_failed:
+            try:
+                self._tokenizer = Tokenizer.from_pretrained(model)
+            except Exception as e:
+                # Do not retry (and re-download) on every benchmark
+                self._tokenizer_failed = True
+                print(f"  Could not load tokenizer for {model}: {e}")
+        return self._tokenizer
+    
+    def _estimate_tokens(self, text: str) -> int:
+        """Count tokens with the loaded tokenizer, or estimate from length."""
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    
+    def _server_max_model_len(self, model: str) -> Optional[int]:
+        """Return the context window vLLM reports for ``model``, if any."""
+        try:
+            models = self.client.get_models()
+        except Exception:
+            return None
+        for info in models:
+            if info.get("id") == model:
+                return info.get("max_model_len")
+        return None
+    
+    def check_workload(self, max_model_len: Optional[int] = None) -> None:
+        """
+        Reject workloads whose requests cannot fit the model's context window.
+        
+        Each request needs room for the shared system prompt (when enabled),
+        its prompt and its max_tokens. Counts use the model's tokenizer when
+        it loads, otherwise an estimate of CHARS_PER_TOKEN characters each.
+        
+        Args:
+            max_model_len: Context window in tokens (if None, read from the
+                server's /v1/models; the check is skipped if it is not
+                reported)
+            
+        Raises:
+            ValueError: If the longest request exceeds ``max_model_len``
+        """
+        if not self.workload:
+            return
+        model = self._resolve_model()
+        if max_model_len is None:
+            max_model_len = self._server_max_model_len(model)
+            if max_model_len is None:
+                return
+        
+        self._load_tokenizer(model)
+        prefix = self._estimate_tokens(self.system_prompt) if self.system_prompt else 0
+        longest = max(
+            self._estimate_tokens(prompt) + max_tokens
+            for prompt, max_tokens in dict.fromkeys(self.workload)
+        )
+        if prefix + longest > max_model_len:
+            raise ValueError(
+                f"Longest request needs about {prefix + longest} tokens "
+                f"({prefix} shared prefix + {longest} prompt and output) but "
+                f"max_model_len is {max_model_len}; lower --random-input-len "
+                f"or --random-output-len, or pass --no-prefix"
+            )
+    
+    async def _warmup(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        count: int
+    ) -> None:
+        """Send untimed requests and discard them (CUDA graph capture, cold KV cache)."""
+        for _ in range(count):
+            try:
+                await self._post_chat(session, url, model, prompt, max_tokens)
+            except Exception:
+                pass
+    
     async def _concurrent_request(
         self,
-        client: CURCLLMClient,
+        session: aiohttp.ClientSession,
+        url: str,
+        model: str,
         prompt: str,
         max_tokens: int,
         request_id: int
     ) -> Dict[str, Any]:
         """Make a single concurrent request."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            # Note: Using sync client in async context - for true async would need async client
-            response = await asyncio.to_thread(
-                client.chat,
-                prompt,
-                max_tokens=max_tokens
-            )
-            latency = time.time() - start_time
+            tokens = await self._post_chat(session, url, model, prompt, max_tokens)
+            latency = time.perf_counter() - start_time
             return {
                 "success": True,
                 "latency": latency,
-                "tokens": len(response.split()),
+                "tokens": tokens,
                 "request_id": request_id
             }
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "latency": time.time() - start_time,
+                "latency": time.perf_counter() - start_time,
                 "request_id": request_id
             }
     
@@ -202,7 +815,8 @@ class PerformanceBenchmark:
         num_concurrent: int = 10,
         num_requests_per_client: int = 5,
         prompt: str = "Describe a sunset.",
-        max_tokens: int = 50
+        max_tokens: int = 50,
+        warmup: int = 3
     ) -> Dict[str, Any]:
         """
         Benchmark concurrent request handling (async version).
@@ -212,6 +826,7 @@ class PerformanceBenchmark:
             num_requests_per_client: Requests per client
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
+            warmup: Untimed requests sent first to absorb server startup cost
             
         Returns:
             Dictionary of concurrency statistics
@@ -223,24 +838,45 @@ class PerformanceBenchmark:
         print(f"Requests per client: {num_requests_per_client}")
         print(f"Total requests: {num_concurrent * num_requests_per_client}\n")
         
-        client = CURCLLMClient(base_url=self.base_url, api_key=self.api_key)
+        url = f"{self.client.base_url}/v1/chat/completions"
+        model = self._resolve_model()
+        # Load up front so deferred token counting never downloads mid-run
+        self._load_tokenizer(model)
         
-        print("Launching concurrent requests...")
-        start_time = time.time()
-        
-        # Create tasks for all requests
-        tasks = []
-        request_id = 0
-        for _ in range(num_concurrent):
-            for _ in range(num_requests_per_client):
-                task = self._concurrent_request(client, prompt, max_tokens, request_id)
-                tasks.append(task)
-                request_id += 1
-        
-        # Execute all concurrently
-        results_list = await asyncio.gather(*tasks)
-        
-        total_duration = time.time() - start_time
+        async with self._create_session(num_concurrent) as session:
+            await self._warmup(session, url, model, prompt, max_tokens, warmup)
+            self._reset_cache_stats()
+            self._reset_deferred_tokens()
+            
+            print("Launching concurrent requests...")
+            start_time = time.perf_counter()
+            
+            total_requests = num_concurrent * num_requests_per_client
+            tasks = [
+                self._concurrent_request(
+                    session, url, model, *self._request_params(i, prompt, max_tokens), i
+                )
+                for i in range(total_requests)
+            ]
+            
+            # Execute all concurrently, aggregating results as they arrive
+            results_list = []
+            live_stats = RunningStats()
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                results_list.append(result)
+                if result["success"]:
+                    live_stats.update(result["latency"])
+                
+                if len(results_list) % 10 == 0:
+                    p99 = live_stats.percentile(99)
+                    p99_text = f", P99 {p99:.3f}s" if p99 is not None else ""
+                    print(
+                        f"  {len(results_list)}/{total_requests} done: "
+                        f"mean {live_stats.mean:.3f}s{p99_text}"
+                    )
+            
+            total_duration = time.perf_counter() - start_time
         
         # Analyze results
         successful = [r for r in results_list if r["success"]]
@@ -248,22 +884,28 @@ class PerformanceBenchmark:
         
         if successful:
             latencies = [r["latency"] for r in successful]
-            total_tokens = sum(r["tokens"] for r in successful)
+            total_tokens = (
+                sum(r["tokens"] for r in successful)
+                + await self._drain_deferred_tokens(model)
+            )
             
+            stats = self._latency_stats(latencies)
             results = {
                 "total_duration_s": total_duration,
                 "total_requests": len(results_list),
                 "successful_requests": len(successful),
                 "failed_requests": len(failed),
-                "mean_latency_s": statistics.mean(latencies),
-                "median_latency_s": statistics.median(latencies),
-                "p95_latency_s": self._percentile(latencies, 95),
-                "p99_latency_s": self._percentile(latencies, 99),
+                "mean_latency_s": stats["mean_latency_s"],
+                "median_latency_s": stats["median_latency_s"],
+                "p95_latency_s": stats["p95_latency_s"],
+                "p99_latency_s": stats["p99_latency_s"],
                 "total_tokens": total_tokens,
                 "overall_throughput_rps": len(successful) / total_duration,
                 "overall_throughput_tps": total_tokens / total_duration,
                 "concurrent_clients": num_concurrent
             }
+            if self.enable_cache:
+                results.update(self._cache_stats())
         else:
             results = {
                 "error": "All requests failed",
@@ -286,13 +928,39 @@ class PerformanceBenchmark:
     
     def benchmark_concurrency(self, **kwargs) -> Dict[str, Any]:
         """Synchronous wrapper for concurrency benchmark."""
-        return asyncio.run(self.benchmark_concurrency_async(**kwargs))
+        return run_async(self.benchmark_concurrency_async(**kwargs))
+    
+    def _latency_stats(self, latencies: List[float]) -> Dict[str, float]:
+        """
+        Summarize latency samples in a single vectorized pass.
+        
+        Percentiles use linear interpolation between the closest ranks.
+        
+        Args:
+            latencies: Per-request latencies in seconds (must be non-empty)
+            
+        Returns:
+            Dictionary of latency statistics
+        """
+        arr = np.fromiter(latencies, dtype=np.float64, count=len(latencies))
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {
+            "mean_latency_s": float(arr.mean()),
+            "median_latency_s": float(p50),
+            "p95_latency_s": float(p95),
+            "p99_latency_s": float(p99),
+            "min_latency_s": float(arr.min()),
+            "max_latency_s": float(arr.max()),
+            "std_dev_s": float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+        }
     
-    def _percentile(self, data: List[float], percentile: float) -> float:
-        """Calculate percentile of data."""
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
+    def _write_results(self, results: Dict[str, Any], path: str) -> None:
+        """Serialize results to ``path`` as indented JSON."""
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
     
     def run_full_benchmark(
         self,
@@ -324,18 +992,26 @@ class PerformanceBenchmark:
             }
         }
         
+        # Each section is flushed to <output_file>.partial as it completes so
+        # a crash mid-run keeps the finished sections
+        partial_file = f"{output_file}.partial" if output_file else None
+        
         try:
             # Latency benchmark
             if quick:
                 all_results["latency"] = self.benchmark_latency(num_requests=20)
             else:
                 all_results["latency"] = self.benchmark_latency(num_requests=100)
+            if partial_file:
+                self._write_results(all_results, partial_file)
             
             # Throughput benchmark
             if quick:
                 all_results["throughput"] = self.benchmark_throughput(duration_seconds=30)
             else:
                 all_results["throughput"] = self.benchmark_throughput(duration_seconds=60)
+            if partial_file:
+                self._write_results(all_results, partial_file)
             
             # Concurrency benchmark
             if quick:
@@ -358,8 +1034,8 @@ class PerformanceBenchmark:
         
         # Save results
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump(all_results, f, indent=2)
+            self._write_results(all_results, partial_file)
+            os.replace(partial_file, output_file)
             print(f"\nResults saved to: {output_file}")
         
         print(f"\n{'#'*60}")
@@ -386,6 +1062,11 @@ def main():
         help="API key for authentication"
     )
     
+    parser.add_argument(
+        "--model",
+        help="Model name to benchmark (default: first model served)"
+    )
+    
     parser.add_argument(
         "--mode",
         choices=["latency", "throughput", "concurrency", "full"],
@@ -399,6 +1080,83 @@ def main():
         help="Run abbreviated benchmarks"
     )
     
+    parser.add_argument(
+        "--dataset-name",
+        choices=["fixed", "random", "hf"],
+        default="fixed",
+        help="Prompt source: one fixed prompt, synthetic random-length "
+             "prompts, or a HuggingFace dataset (default: fixed)"
+    )
+    
+    parser.add_argument(
+        "--num-prompts",
+        type=int,
+        default=1000,
+        help="Number of prompts to pre-generate for random/hf datasets"
+    )
+    
+    parser.add_argument(
+        "--random-input-len",
+        type=int,
+        default=256,
+        help="Mean prompt length in tokens for the random dataset (default: "
+             "256); the shared system prompt adds over 1K tokens on top "
+             "unless --no-prefix is given"
+    )
+    
+    parser.add_argument(
+        "--random-output-len",
+        type=int,
+        default=128,
+        help="Mean max_tokens per request for random/hf datasets"
+    )
+    
+    parser.add_argument(
+        "--random-range-ratio",
+        type=float,
+        default=0.0,
+        help="Draw lengths uniformly from [(1-r)*len, (1+r)*len]"
+    )
+    
+    parser.add_argument(
+        "--hf-dataset",
+        default=DEFAULT_HF_DATASET,
+        help=f"HuggingFace dataset for --dataset-name hf (default: {DEFAULT_HF_DATASET})"
+    )
+    
+    parser.add_argument(
+        "--hf-field",
+        default="question",
+        help="Dataset column holding the prompt text (default: question)"
+    )
+    
+    parser.add_argument(
+        "--max-model-len",
+        type=int,
+        help="Server context window used to validate random/hf workloads "
+             "(default: as reported by /v1/models)"
+    )
+    
+    parser.add_argument(
+        "--no-prefix",
+        action="store_true",
+        help="Do not send the shared system prompt (disables prefix cache reuse)"
+    )
+    
+    parser.add_argument(
+        "--enable-cache",
+        action="store_true",
+        help="Serve repeated identical requests from an in-process response "
+             "cache (only applies with --temperature 0)"
+    )
+    
+    parser.add_argument(
+        "--temperature",
+        type=float,
+        default=TEMPERATURE,
+        help=f"Sampling temperature for every request (default: {TEMPERATURE})"
+    )
+    
     parser.add_argument(
         "--output",
         help="Output file for results (JSON)"
@@ -411,6 +1169,15 @@ def main():
         help="Number of requests for latency benchmark"
     )
     
+    parser.add_argument(
+        "--pipeline-depth",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Requests kept in flight for latency benchmark; pass several "
+             "values to sweep (default: 1)"
+    )
+    
     parser.add_argument(
         "--duration",
         type=int,
@@ -418,6 +1185,13 @@ def main():
         help="Duration in seconds for throughput benchmark"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=32,
+        help="Number of concurrent workers for throughput benchmark (default: 32)"
+    )
+    
     parser.add_argument(
         "--concurrent",
         type=int,
@@ -429,18 +1203,49 @@ def main():
     
     benchmark = PerformanceBenchmark(
         base_url=args.base_url,
-        api_key=args.api_key
+        api_key=args.api_key,
+        shared_prefix=not args.no_prefix,
+        enable_cache=args.enable_cache,
+        temperature=args.temperature,
+        model=args.model
     )
     
+    if args.dataset_name != "fixed":
+        # The tokenizer sizes random prompts in tokens rather than words
+        tokenizer = benchmark._load_tokenizer(benchmark._resolve_model())
+        benchmark.workload = build_workload(
+            dataset_name=args.dataset_name,
+            num_prompts=args.num_prompts,
+            input_len=args.random_input_len,
+            output_len=args.random_output_len,
+            range_ratio=args.random_range_ratio,
+            hf_dataset=args.hf_dataset,
+            hf_field=args.hf_field,
+            tokenizer=tokenizer
+        )
+        try:
+            benchmark.check_workload(args.max_model_len)
+        except ValueError as e:
+            parser.error(str(e))
+    
     if args.mode == "full":
         results = benchmark.run_full_benchmark(
             output_file=args.output,
             quick=args.quick
         )
     elif args.mode == "latency":
-        results = benchmark.benchmark_latency(num_requests=args.num_requests)
+        results = {
+            depth: benchmark.benchmark_latency(
+                num_requests=args.num_requests,
+                pipeline_depth=depth
+            )
+            for depth in args.pipeline_depth
+        }
     elif args.mode == "throughput":
-        results = benchmark.benchmark_throughput(duration_seconds=args.duration)
+        results = benchmark.benchmark_throughput(
+            duration_seconds=args.duration,
+            concurrency=args.workers
+        )
     elif args.mode == "concurrency":
         results = benchmark.benchmark_concurrency(num_concurrent=args.concurrent)
     
@@ -17,7 +17,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/patrickcooper/curc-llm-hoster",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Science/Research",
@@ -40,18 +40,23 @@ setup(
         "requests>=2.31.0",
     ],
     extras_require={
+        "aiohttp": [
+            "aiohttp>=3.9.0",
+        ],
+        "orjson": [
+            "orjson>=3.6.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.3.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.4.0",
         ],
     },
-    entry_points={
-        "console_scripts": [
-            "curc-llm=src.client.curc_llm_client:main",
-        ],
-    },
 )
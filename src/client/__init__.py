@@ -4,6 +4,11 @@ CURC LLM Client Module
 Author: Patrick Cooper
 """
 
-from .curc_llm_client import CURCLLMClient, create_client
+from .curc_llm_client import (
+    AsyncCURCLLMClient,
+    CURCLLMClient,
+    create_client,
+    get_shared_client,
+)
 
-__all__ = ['CURCLLMClient', 'create_client']
+__all__ = ['AsyncCURCLLMClient', 'CURCLLMClient', 'create_client', 'get_shared_client']
@@ -8,10 +8,85 @@ hosted on CURC infrastructure. It offers both OpenAI-compatible and
 native vLLM interfaces.
 """
 
+import asyncio
+import json
 import os
-from typing import Dict, List, Optional, Union, Iterator
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union, Iterator
 import httpx
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import aiohttp
+except ImportError:  # optional: pip install curc-llm-hoster[aiohttp]
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # optional: pip install curc-llm-hoster[orjson]
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:  # optional: pip install curc-llm-hoster[http2]
+    HTTP2_AVAILABLE = False
+
+
+# Upper bound on memoized temperature-0 responses per client
+RESPONSE_CACHE_MAX_SIZE = 1024
+
+# Upper bound on memoized system message dicts per client
+SYSTEM_MESSAGE_CACHE_MAX_SIZE = 64
+
+# Seconds a discovered default model name stays valid for a server
+MODEL_CACHE_TTL = 300.0
+
+# Maximum number of distinct configurations kept by get_shared_client
+SHARED_CLIENT_MAX_SIZE = 16
+
+
+def _parse_json(response: httpx.Response):
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+def _loads(data: Union[str, bytes]):
+    """Decode JSON text, using orjson when it is installed."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+class _ModelCache:
+    """Default model names shared by all clients, keyed by base_url."""
+    
+    _data: Dict[str, Tuple[float, str]] = {}
+    
+    @classmethod
+    def get(cls, base_url: str) -> Optional[str]:
+        """Return the cached model for a server if it has not expired."""
+        entry = cls._data.get(base_url)
+        if entry is None:
+            return None
+        fetched_at, model = entry
+        if time.monotonic() - fetched_at >= MODEL_CACHE_TTL:
+            return None
+        return model
+    
+    @classmethod
+    def put(cls, base_url: str, model: str):
+        """Record the default model for a server."""
+        cls._data[base_url] = (time.monotonic(), model)
+    
+    @classmethod
+    def clear(cls):
+        """Forget every cached model."""
+        cls._data.clear()
 
 
 class CURCLLMClient:
@@ -45,7 +120,9 @@ class CURCLLMClient:
         base_url: str = "http://localhost:8000",
         api_key: Optional[str] = None,
         timeout: float = 60.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        always_stream: bool = False,
+        warmup: bool = False
     ):
         """
         Initialize CURC LLM client.
@@ -55,25 +132,75 @@ class CURCLLMClient:
             api_key: Optional API key for authentication
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            always_stream: Have chat() stream every response from the server
+            warmup: Open server connections immediately (see warmup())
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key or os.getenv("CURC_LLM_API_KEY")
         self.timeout = timeout
         self.max_retries = max_retries
-        self._model_cache: Optional[str] = None
+        self.always_stream = always_stream
+        # System messages reused across calls, keyed by prompt text
+        self._sys_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        # Deterministic (temperature 0) responses keyed by request parameters
+        self._resp_cache: "OrderedDict[tuple, str]" = OrderedDict()
         
-        # Initialize OpenAI client for chat completions
-        self.openai_client = OpenAI(
-            base_url=f"{self.base_url}/v1",
-            api_key=self.api_key or "dummy-key",  # vLLM requires a key even if not used
-            timeout=timeout,
-            max_retries=max_retries
-        )
+        # Underlying clients are built on first use
+        self._openai: Optional[OpenAI] = None
+        self._http: Optional[httpx.Client] = None
+        # Guards the caches and lazy client construction, since
+        # get_shared_client hands one instance to many threads
+        self._lock = threading.Lock()
+        # Shared-client bookkeeping, managed under _shared_lock (see
+        # get_shared_client)
+        self._shared = False
+        self._holders = 0
+        self._evicted = False
         
-        # Initialize httpx client for direct API calls
-        self.http_client = httpx.Client(
-            timeout=timeout,
-            headers=self._get_headers()
+        if warmup:
+            self.warmup()
+    
+    @property
+    def openai_client(self) -> OpenAI:
+        """OpenAI client for chat completions, created on first access."""
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    self._openai = OpenAI(
+                        base_url=f"{self.base_url}/v1",
+                        api_key=self.api_key or "dummy-key",  # vLLM requires a key even if not used
+                        timeout=self.timeout,
+                        max_retries=self.max_retries
+                    )
+        return self._openai
+    
+    @property
+    def http_client(self) -> httpx.Client:
+        """httpx client for direct API calls, created on first access."""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = self._build_http_client()
+        return self._http
+    
+    def _build_http_client(self) -> httpx.Client:
+        """Build the pooled httpx client behind ``http_client``."""
+        # Keep idle connections alive so repeated calls skip the TCP/TLS
+        # handshake. HTTP/2 multiplexing is negotiated over TLS when h2
+        # is installed. Limits go on the transport, since httpx ignores
+        # client-level limits once a transport is supplied.
+        return httpx.Client(
+            timeout=self.timeout,
+            headers=self._get_headers(),
+            transport=httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=self.max_retries,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=90.0
+                )
+            )
         )
     
     def _get_headers(self) -> Dict[str, str]:
@@ -83,6 +210,39 @@ class CURCLLMClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
     
+    def warmup(self) -> None:
+        """
+        Pre-open connections so the first real request skips the handshake.
+        
+        Sends a /health check over the direct HTTP client and lists models
+        through the OpenAI client, leaving a kept-alive connection in each
+        pool. Failures are ignored; the server may still be starting.
+        """
+        try:
+            self.http_client.get(f"{self.base_url}/health")
+            self.openai_client.models.list()
+        except Exception:
+            pass
+    
+    def _build_messages(
+        self,
+        message: str,
+        system_prompt: Optional[str]
+    ) -> Tuple[Dict[str, str], ...]:
+        """Build the chat messages, reusing recent system message dicts."""
+        if system_prompt:
+            with self._lock:
+                sys_msg = self._sys_cache.get(system_prompt)
+                if sys_msg is None:
+                    sys_msg = {"role": "system", "content": system_prompt}
+                    self._sys_cache[system_prompt] = sys_msg
+                    if len(self._sys_cache) > SYSTEM_MESSAGE_CACHE_MAX_SIZE:
+                        self._sys_cache.popitem(last=False)
+                else:
+                    self._sys_cache.move_to_end(system_prompt)
+            return (sys_msg, {"role": "user", "content": message})
+        return ({"role": "user", "content": message},)
+    
     def chat(
         self,
         message: str,
@@ -90,38 +250,118 @@ class CURCLLMClient:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 512,
+        cache: bool = True,
+        stream_to: Optional[Callable[[str], None]] = None,
+        raw: bool = False,
         **kwargs
     ) -> str:
         """
         Send a chat message and get a response.
         
+        When stream_to is given (or the client was built with
+        always_stream), the response is streamed from the server and each
+        chunk is handed to the callback as it arrives, so the first tokens
+        appear after the time-to-first-token rather than the full
+        generation time. The complete text is still returned.
+        
         Args:
             message: User message to send
             model: Model name (if None, uses server default)
             system_prompt: Optional system prompt
             temperature: Sampling temperature (0.0-2.0)
             max_tokens: Maximum tokens to generate
+            cache: Reuse an earlier identical response when temperature is 0
+            stream_to: Optional callback invoked with each streamed chunk
+            raw: POST directly over the HTTP client, skipping the SDK's
+                response models
             **kwargs: Additional parameters passed to the API
             
         Returns:
             Generated response text
         """
-        messages = []
+        model = model or self._get_default_model()
+        key = None
+        if cache and temperature == 0.0:
+            key = self._cache_key(
+                "chat", model, system_prompt, message, max_tokens, kwargs
+            )
+            cached = self._cache_get(key)
+            if cached is not None:
+                if stream_to is not None:
+                    stream_to(cached)
+                return cached
         
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        messages = self._build_messages(message, system_prompt)
         
-        messages.append({"role": "user", "content": message})
+        if stream_to is None and not self.always_stream:
+            if raw:
+                content = self._raw_chat(
+                    messages,
+                    model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs
+                )
+            else:
+                response = self.openai_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs
+                )
+                content = response.choices[0].message.content
+        else:
+            parts = []
+            for delta in self._stream_chat(
+                messages, model, temperature, max_tokens, raw, **kwargs
+            ):
+                parts.append(delta)
+                if stream_to is not None:
+                    stream_to(delta)
+            content = "".join(parts)
         
+        self._cache_put(key, content)
+        return content
+    
+    def chat_samples(
+        self,
+        message: str,
+        n: int = 4,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate several samples for one message in a single request.
+        
+        The server prefills the prompt once and decodes all n samples
+        together, instead of repeating the prefill for n separate calls.
+        
+        Args:
+            message: User message to send
+            n: Number of samples to generate
+            model: Model name (if None, uses server default)
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate per sample
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated response texts, one per sample
+        """
         response = self.openai_client.chat.completions.create(
             model=model or self._get_default_model(),
-            messages=messages,
+            messages=self._build_messages(message, system_prompt),
             temperature=temperature,
             max_tokens=max_tokens,
+            n=n,
             **kwargs
         )
         
-        return response.choices[0].message.content
+        return [choice.message.content for choice in response.choices]
     
     def chat_stream(
         self,
@@ -130,6 +370,7 @@ class CURCLLMClient:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 512,
+        raw: bool = False,
         **kwargs
     ) -> Iterator[str]:
         """
@@ -141,20 +382,44 @@ class CURCLLMClient:
             system_prompt: Optional system prompt
             temperature: Sampling temperature (0.0-2.0)
             max_tokens: Maximum tokens to generate
+            raw: Parse the server-sent events directly instead of building
+                an SDK model per chunk
             **kwargs: Additional parameters passed to the API
             
         Yields:
             Response text chunks as they arrive
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        messages.append({"role": "user", "content": message})
+        yield from self._stream_chat(
+            self._build_messages(message, system_prompt),
+            model or self._get_default_model(),
+            temperature,
+            max_tokens,
+            raw,
+            **kwargs
+        )
+    
+    def _stream_chat(
+        self,
+        messages: Tuple[Dict[str, str], ...],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        raw: bool,
+        **kwargs
+    ) -> Iterator[str]:
+        """Yield non-empty content deltas from the SDK or the raw SSE stream."""
+        if raw:
+            yield from self._raw_chat_stream(
+                messages,
+                model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+            return
         
         stream = self.openai_client.chat.completions.create(
-            model=model or self._get_default_model(),
+            model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
@@ -163,8 +428,96 @@ class CURCLLMClient:
         )
         
         for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    
+    def _raw_chat(
+        self,
+        messages: Tuple[Dict[str, str], ...],
+        model: str,
+        **kwargs
+    ) -> str:
+        """
+        POST a chat completion over the HTTP client and parse it directly.
+        
+        Args:
+            messages: Chat messages to send
+            model: Model name
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated response text
+        """
+        response = self.http_client.post(
+            f"{self.base_url}/v1/chat/completions",
+            json={"model": model, "messages": messages, **kwargs}
+        )
+        response.raise_for_status()
+        return _parse_json(response)["choices"][0]["message"]["content"]
+    
+    def _raw_chat_stream(
+        self,
+        messages: Tuple[Dict[str, str], ...],
+        model: str,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion, decoding the server-sent events directly.
+        
+        Args:
+            messages: Chat messages to send
+            model: Model name
+            **kwargs: Additional parameters passed to the API
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        with self.http_client.stream(
+            "POST",
+            f"{self.base_url}/v1/chat/completions",
+            json={"model": model, "messages": messages, "stream": True, **kwargs}
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                choices = _loads(data)["choices"]
+                if choices:
+                    content = choices[0]["delta"].get("content")
+                    if content:
+                        yield content
+    
+    def chat_stream_collected(
+        self,
+        message: str,
+        **kwargs
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Stream a chat response and collect it into one string.
+        
+        Chunks are gathered in a list and joined once, avoiding repeated
+        string concatenation on long outputs.
+        
+        Args:
+            message: User message to send
+            **kwargs: Additional parameters passed to chat_stream
+            
+        Returns:
+            Tuple of (full response text, seconds to first chunk or None
+            if the stream was empty)
+        """
+        chunks: List[str] = []
+        ttft = None
+        start = time.perf_counter()
+        for chunk in self.chat_stream(message, **kwargs):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            chunks.append(chunk)
+        return "".join(chunks), ttft
     
     def complete(
         self,
@@ -172,6 +525,7 @@ class CURCLLMClient:
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 512,
+        cache: bool = True,
         **kwargs
     ) -> str:
         """
@@ -182,20 +536,66 @@ class CURCLLMClient:
             model: Model name (if None, uses server default)
             temperature: Sampling temperature (0.0-2.0)
             max_tokens: Maximum tokens to generate
+            cache: Reuse an earlier identical completion when temperature is 0
             **kwargs: Additional parameters passed to the API
             
         Returns:
             Generated completion text
         """
+        model = model or self._get_default_model()
+        key = None
+        if cache and temperature == 0.0:
+            key = self._cache_key("complete", model, None, prompt, max_tokens, kwargs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+        
         response = self.openai_client.completions.create(
-            model=model or self._get_default_model(),
+            model=model,
             prompt=prompt,
             temperature=temperature,
             max_tokens=max_tokens,
             **kwargs
         )
         
-        return response.choices[0].text
+        text = response.choices[0].text
+        self._cache_put(key, text)
+        return text
+    
+    def complete_batch(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate completions for several prompts in one request.
+        
+        vLLM schedules the whole list together, so the prompts share
+        batched prefill passes instead of paying one round trip each.
+        
+        Args:
+            prompts: Input prompts
+            model: Model name (if None, uses server default)
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate per prompt
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated completion texts in prompt order
+        """
+        response = self.openai_client.completions.create(
+            model=model or self._get_default_model(),
+            prompt=prompts,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        choices = sorted(response.choices, key=lambda choice: choice.index)
+        return [choice.text for choice in choices]
     
     def complete_stream(
         self,
@@ -228,20 +628,62 @@ class CURCLLMClient:
         )
         
         for chunk in stream:
-            if chunk.choices[0].text:
-                yield chunk.choices[0].text
+            text = chunk.choices[0].text
+            if text:
+                yield text
+    
+    @staticmethod
+    def _cache_key(
+        kind: str,
+        model: str,
+        system_prompt: Optional[str],
+        text: str,
+        max_tokens: int,
+        kwargs: Dict
+    ) -> Optional[tuple]:
+        """Build a response-cache key, or None if kwargs are unhashable."""
+        try:
+            return (kind, model, system_prompt, text, max_tokens, frozenset(kwargs.items()))
+        except TypeError:
+            return None
+    
+    def _cache_get(self, key: Optional[tuple]) -> Optional[str]:
+        """Return a cached response and mark it most recently used."""
+        if key is None:
+            return None
+        with self._lock:
+            value = self._resp_cache.get(key)
+            if value is not None:
+                self._resp_cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, key: Optional[tuple], value: Optional[str]):
+        """Store a response, evicting the least recently used entry when full."""
+        if key is None or value is None:
+            return
+        with self._lock:
+            self._resp_cache[key] = value
+            if len(self._resp_cache) > RESPONSE_CACHE_MAX_SIZE:
+                self._resp_cache.popitem(last=False)
+    
+    def cache_clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._resp_cache.clear()
     
     def _get_default_model(self) -> str:
-        """Return the first available model name, fetching once and caching."""
-        if self._model_cache:
-            return self._model_cache
+        """Return the first available model name, shared across clients."""
+        cached = _ModelCache.get(self.base_url)
+        if cached:
+            return cached
         response = self.http_client.get(f"{self.base_url}/v1/models")
         response.raise_for_status()
-        models = response.json().get("data", [])
+        models = _parse_json(response).get("data", [])
         if not models:
             raise RuntimeError("No models available on the server.")
-        self._model_cache = models[0]["id"]
-        return self._model_cache
+        model = models[0]["id"]
+        _ModelCache.put(self.base_url, model)
+        return model
 
     def health_check(self) -> Dict:
         """
@@ -265,11 +707,31 @@ class CURCLLMClient:
         """
         response = self.http_client.get(f"{self.base_url}/v1/models")
         response.raise_for_status()
-        return response.json()["data"]
+        return _parse_json(response)["data"]
     
     def close(self):
-        """Close HTTP client connections."""
-        self.http_client.close()
+        """
+        Close whichever HTTP clients have been created.
+        
+        For clients returned by get_shared_client this releases one holder;
+        the connections are closed once the client has been evicted and its
+        last holder has released it.
+        """
+        if not self._shared:
+            self._close()
+            return
+        with _shared_lock:
+            self._holders = max(self._holders - 1, 0)
+            release = self._evicted and self._holders == 0
+        if release:
+            self._close()
+    
+    def _close(self):
+        """Close the underlying HTTP clients unconditionally."""
+        if self._http is not None:
+            self._http.close()
+        if self._openai is not None:
+            self._openai.close()
     
     def __enter__(self):
         """Context manager entry."""
@@ -280,6 +742,338 @@ class CURCLLMClient:
         self.close()
 
 
+class AsyncCURCLLMClient:
+    """
+    Asyncio client for CURC-hosted LLM inference servers.
+    
+    Mirrors CURCLLMClient with awaitable methods so many requests can be
+    in flight at once instead of blocking on each round trip.
+    
+    Examples:
+        Concurrent batch:
+        >>> async with AsyncCURCLLMClient() as client:
+        ...     replies = await client.chat_many(prompts, concurrency=8)
+        
+        With streaming:
+        >>> async for chunk in client.achat_stream("Tell me a story"):
+        ...     print(chunk, end="", flush=True)
+        
+        Bypassing the SDK for high-concurrency batches:
+        >>> client = AsyncCURCLLMClient(use_aiohttp=True)
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        api_key: Optional[str] = None,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        use_aiohttp: bool = False
+    ):
+        """
+        Initialize async CURC LLM client.
+        
+        Args:
+            base_url: Base URL of the vLLM server
+            api_key: Optional API key for authentication
+            timeout: Request timeout in seconds
+            max_retries: Maximum number of retry attempts
+            use_aiohttp: Send non-streaming chats over a raw aiohttp session
+                instead of the OpenAI SDK (requires the aiohttp extra)
+        """
+        if use_aiohttp and aiohttp is None:
+            raise ImportError(
+                "use_aiohttp requires aiohttp: pip install curc-llm-hoster[aiohttp]"
+            )
+        
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key or os.getenv("CURC_LLM_API_KEY")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.use_aiohttp = use_aiohttp
+        # Created on first use, since aiohttp sessions bind to a running loop
+        self._session = None
+        
+        self.openai_client = AsyncOpenAI(
+            base_url=f"{self.base_url}/v1",
+            api_key=self.api_key or "dummy-key",  # vLLM requires a key even if not used
+            timeout=timeout,
+            max_retries=max_retries
+        )
+        
+        # Transport-level retries cover connection failures on the
+        # idempotent /health and /v1/models GETs
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=self._get_headers(),
+            transport=httpx.AsyncHTTPTransport(
+                retries=max_retries,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=90.0
+                )
+            )
+        )
+    
+    def _get_headers(self) -> Dict[str, str]:
+        """Get HTTP headers for requests."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+    
+    async def achat(
+        self,
+        message: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> str:
+        """
+        Send a chat message and await the response.
+        
+        Args:
+            message: User message to send
+            model: Model name (if None, uses server default)
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated response text
+        """
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": message})
+        
+        if self.use_aiohttp:
+            return await self._raw_chat(
+                messages,
+                model=model or await self._get_default_model(),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        
+        response = await self.openai_client.chat.completions.create(
+            model=model or await self._get_default_model(),
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        return response.choices[0].message.content
+    
+    async def _raw_chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> str:
+        """
+        POST a chat completion directly with aiohttp, skipping the SDK.
+        
+        Args:
+            messages: Chat messages to send
+            model: Model name
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated response text
+        """
+        session = self._get_session()
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        async with session.post(
+            f"{self.base_url}/v1/chat/completions", json=payload
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return data["choices"][0]["message"]["content"]
+    
+    def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self._get_headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def achat_stream(
+        self,
+        message: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Send a chat message and stream the response.
+        
+        Args:
+            message: User message to send
+            model: Model name (if None, uses server default)
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters passed to the API
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": message})
+        
+        stream = await self.openai_client.chat.completions.create(
+            model=model or await self._get_default_model(),
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs
+        )
+        
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    
+    async def acomplete(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        **kwargs
+    ) -> str:
+        """
+        Generate a completion for a prompt.
+        
+        Args:
+            prompt: Input prompt
+            model: Model name (if None, uses server default)
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters passed to the API
+            
+        Returns:
+            Generated completion text
+        """
+        response = await self.openai_client.completions.create(
+            model=model or await self._get_default_model(),
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        return response.choices[0].text
+    
+    async def chat_many(
+        self,
+        messages: List[str],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Union[str, BaseException]]:
+        """
+        Send many chat messages with bounded concurrency.
+        
+        Args:
+            messages: User messages to send
+            concurrency: Maximum number of requests in flight at once
+            **kwargs: Additional parameters passed to achat
+            
+        Returns:
+            Responses in input order; failed requests hold their exception
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _one(message):
+            async with semaphore:
+                return await self.achat(message, **kwargs)
+        
+        return await asyncio.gather(
+            *(_one(message) for message in messages),
+            return_exceptions=True
+        )
+    
+    async def _get_default_model(self) -> str:
+        """Return the first available model name, shared across clients."""
+        cached = _ModelCache.get(self.base_url)
+        if cached:
+            return cached
+        response = await self.http_client.get(f"{self.base_url}/v1/models")
+        response.raise_for_status()
+        models = _parse_json(response).get("data", [])
+        if not models:
+            raise RuntimeError("No models available on the server.")
+        model = models[0]["id"]
+        _ModelCache.put(self.base_url, model)
+        return model
+    
+    async def health_check(self) -> Dict:
+        """
+        Check server health status.
+        
+        Returns:
+            Health status dictionary
+        """
+        response = await self.http_client.get(f"{self.base_url}/health")
+        response.raise_for_status()
+        text = response.text.strip()
+        return {"status": "ok", "http": response.status_code, "body": text or "(empty)"}
+    
+    async def get_models(self) -> List[Dict]:
+        """
+        Get list of available models.
+        
+        Returns:
+            List of model information dictionaries
+        """
+        response = await self.http_client.get(f"{self.base_url}/v1/models")
+        response.raise_for_status()
+        return _parse_json(response)["data"]
+    
+    async def close(self):
+        """Close HTTP client connections."""
+        await self.openai_client.close()
+        await self.http_client.aclose()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+
 def create_client(
     base_url: str = "http://localhost:8000",
     api_key: Optional[str] = None,
@@ -297,3 +1091,62 @@ def create_client(
         Configured CURCLLMClient instance
     """
     return CURCLLMClient(base_url=base_url, api_key=api_key, **kwargs)
+
+
+# Clients handed out by get_shared_client, least recently used first
+_shared_clients: "OrderedDict[tuple, CURCLLMClient]" = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(
+    base_url: str = "http://localhost:8000",
+    api_key: Optional[str] = None,
+    timeout: float = 60.0,
+    max_retries: int = 3
+) -> CURCLLMClient:
+    """
+    Return a process-wide CURC LLM client for the given configuration.
+    
+    Repeated calls with the same arguments return the same instance, so
+    call sites that would otherwise build a client per request share one
+    connection pool. Every call counts as one holder: release it with
+    ``close()`` or a ``with`` block when done, which leaves the client open
+    for the other holders. Up to SHARED_CLIENT_MAX_SIZE configurations are
+    kept; an evicted client is closed once its last holder releases it.
+    
+    Args:
+        base_url: Base URL of the vLLM server
+        api_key: Optional API key for authentication
+        timeout: Request timeout in seconds
+        max_retries: Maximum number of retry attempts
+        
+    Returns:
+        Shared CURCLLMClient instance
+    """
+    key = (base_url.rstrip('/'), api_key, timeout, max_retries)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is not None:
+            _shared_clients.move_to_end(key)
+            client._holders += 1
+            return client
+        
+        client = CURCLLMClient(
+            base_url=key[0],
+            api_key=api_key,
+            timeout=timeout,
+            max_retries=max_retries
+        )
+        client._shared = True
+        client._holders = 1
+        _shared_clients[key] = client
+        released = []
+        while len(_shared_clients) > SHARED_CLIENT_MAX_SIZE:
+            _, evicted = _shared_clients.popitem(last=False)
+            evicted._evicted = True
+            if evicted._holders == 0:
+                released.append(evicted)
+    # Close outside the lock; nobody holds these any more
+    for evicted in released:
+        evicted._close()
+    return client
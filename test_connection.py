@@ -14,6 +14,11 @@ Usage:
 import httpx
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def test_connection(base_url="http://localhost:8000"):
     """Test connection to vLLM server"""
     
@@ -23,21 +28,24 @@ def test_connection(base_url="http://localhost:8000"):
     print(f"\nTesting connection to: {base_url}")
     
     try:
-        # Test health endpoint (vLLM returns 200 with empty body)
-        print("\n1. Testing health endpoint...")
-        response = httpx.get(f"{base_url}/health", timeout=5.0)
-        response.raise_for_status()
-        body = response.text.strip()
-        print(f"   ✓ Health check: HTTP {response.status_code} {body or '(ok)'}")
-        
-        # Test models endpoint
-        print("\n2. Testing models endpoint...")
-        response = httpx.get(f"{base_url}/v1/models", timeout=5.0)
-        response.raise_for_status()
-        models = response.json()
-        print(f"   ✓ Available models: {len(models.get('data', []))}")
-        for model in models.get('data', []):
-            print(f"     - {model.get('id', 'unknown')}")
+        # One client for both checks so the second request reuses the
+        # connection opened by the first
+        with httpx.Client(base_url=base_url, timeout=5.0) as client:
+            # Test health endpoint (vLLM returns 200 with empty body)
+            print("\n1. Testing health endpoint...")
+            response = client.get("/health")
+            response.raise_for_status()
+            body = response.text.strip()
+            print(f"   ✓ Health check: HTTP {response.status_code} {body or '(ok)'}")
+            
+            # Test models endpoint
+            print("\n2. Testing models endpoint...")
+            response = client.get("/v1/models")
+            response.raise_for_status()
+            models = orjson.loads(response.content) if orjson else response.json()
+            print(f"   ✓ Available models: {len(models.get('data', []))}")
+            for model in models.get('data', []):
+                print(f"     - {model.get('id', 'unknown')}")
         
         print("\n" + "=" * 60)
         print("SUCCESS! Server is ready to use.")
@@ -4,28 +4,61 @@ Author: Patrick Cooper
 """
 
 import pytest
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from src.client.curc_llm_client import AsyncCURCLLMClient, CURCLLMClient
 
 
 UNIT_TEST_MODEL = "test-model/unit-test"
 
+# Text files read by the documentation and packaging tests
+DOC_PATHS = (
+    "README.md",
+    "requirements.txt",
+    "setup.py",
+    "pytest.ini",
+    "config/.env.example",
+)
+
+
+@pytest.fixture(scope="session")
+def server_config():
+    """Parsed config/server_config.yaml, loaded once per test session."""
+    # Imported here so sessions that never request the config skip PyYAML
+    import yaml
+    
+    # libyaml's C parser when PyYAML was built with it, else the pure-Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open("config/server_config.yaml", "rb") as f:
+        return yaml.load(f, Loader=loader)
+
+
+@pytest.fixture(scope="session")
+def doc_bytes():
+    """Raw contents of DOC_PATHS keyed by path, read once per test session."""
+    return {path: Path(path).read_bytes() for path in DOC_PATHS}
+
 
 @pytest.fixture(autouse=True)
 def mock_default_model(request):
     """
     Patch _get_default_model for all unit tests so they don't require a
-    running server. Integration tests (classes containing 'Integration')
-    are excluded and make real calls.
+    running server. Tests marked ``integration`` are excluded and make
+    real calls.
     """
-    cls = getattr(request.node, "cls", None)
-    is_integration = cls is not None and "Integration" in cls.__name__
-
-    if is_integration:
+    if request.node.get_closest_marker("integration"):
         yield
         return
 
-    with patch(
-        "src.client.curc_llm_client.CURCLLMClient._get_default_model",
+    with patch.object(
+        CURCLLMClient,
+        "_get_default_model",
+        return_value=UNIT_TEST_MODEL,
+    ), patch.object(
+        AsyncCURCLLMClient,
+        "_get_default_model",
+        new_callable=AsyncMock,
         return_value=UNIT_TEST_MODEL,
     ):
         yield
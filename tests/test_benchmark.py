@@ -5,7 +5,11 @@ Author: Patrick Cooper
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
+import itertools
+import json
+import threading
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import sys
 import os
 
@@ -15,6 +19,55 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 import benchmark_performance
 
 
+class _FakeResponse:
+    """Minimal stand-in for an aiohttp response context manager."""
+    
+    def __init__(self, payload):
+        self._payload = payload
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    async def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    """Minimal stand-in for an aiohttp session returning chat responses."""
+    
+    def __init__(self, responses=None):
+        self.post = Mock()
+        if responses is None:
+            self.post.side_effect = lambda *args, **kwargs: _FakeResponse(_chat_payload())
+        else:
+            self.post.side_effect = responses
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _posted_json(call):
+    """Decode the JSON body of a recorded session.post call."""
+    return json.loads(call.kwargs["data"])
+
+
+def _chat_payload(content="Test response", completion_tokens=7):
+    """Build a /v1/chat/completions JSON body."""
+    return {
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 8, "completion_tokens": completion_tokens}
+    }
+
+
 class TestPerformanceBenchmark:
     """Test suite for PerformanceBenchmark class."""
     
@@ -33,31 +86,74 @@ class TestPerformanceBenchmark:
         assert benchmark.base_url == "http://test:9000"
         assert benchmark.api_key == "test-key"
     
-    def test_percentile_calculation(self):
-        """Test percentile calculation."""
+    def test_benchmark_shared_prefix(self):
+        """Test the shared system prompt is on by default and can be disabled."""
         benchmark = benchmark_performance.PerformanceBenchmark()
+        assert benchmark.system_prompt == benchmark_performance.SHARED_SYSTEM
         
-        data = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        benchmark = benchmark_performance.PerformanceBenchmark(shared_prefix=False)
+        assert benchmark.system_prompt is None
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_benchmark_reuses_single_client(self, mock_client):
+        """Test all benchmarks share the client built at initialization."""
+        mock_instance = Mock()
+        mock_client.return_value = mock_instance
         
-        p50 = benchmark._percentile(data, 50)
-        assert p50 == 6  # 50% of 10 items = index 5 (0-indexed)
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_create_session', return_value=_FakeSession()):
+            benchmark.benchmark_latency(num_requests=2)
+            benchmark.benchmark_latency(num_requests=2)
         
-        p95 = benchmark._percentile(data, 95)
-        assert p95 == 10
+        assert mock_client.call_count == 1
+        assert benchmark.client is mock_instance
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_model_resolved_once(self, mock_client):
+        """Test the default model is looked up once and then reused."""
+        mock_client.return_value._get_default_model.return_value = "served-model"
         
-        p99 = benchmark._percentile(data, 99)
-        assert p99 == 10
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        assert benchmark._resolve_model() == "served-model"
+        assert benchmark._resolve_model() == "served-model"
+        assert mock_client.return_value._get_default_model.call_count == 1
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_explicit_model_skips_lookup(self, mock_client):
+        """Test an explicit model never queries /v1/models."""
+        session = _FakeSession()
+        
+        benchmark = benchmark_performance.PerformanceBenchmark(model="custom-model")
+        with patch.object(benchmark, '_create_session', return_value=session):
+            benchmark.benchmark_latency(num_requests=2, warmup=0)
+        
+        mock_client.return_value._get_default_model.assert_not_called()
+        assert _posted_json(session.post.call_args)["model"] == "custom-model"
+    
+    def test_latency_stats_calculation(self):
+        """Test latency statistics with interpolated percentiles."""
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        
+        data = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        stats = benchmark._latency_stats(data)
+        
+        assert stats["mean_latency_s"] == 5.5
+        assert stats["median_latency_s"] == 5.5
+        assert stats["p95_latency_s"] == pytest.approx(9.55)
+        assert stats["p99_latency_s"] == pytest.approx(9.91)
+        assert stats["min_latency_s"] == 1
+        assert stats["max_latency_s"] == 10
+        assert stats["std_dev_s"] == pytest.approx(3.0277, abs=1e-4)
     
     @patch('benchmark_performance.CURCLLMClient')
     def test_latency_benchmark(self, mock_client):
         """Test latency benchmark."""
-        # Mock client responses
-        mock_instance = Mock()
-        mock_instance.chat.return_value = "Test response"
-        mock_client.return_value = mock_instance
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        session = _FakeSession()
         
         benchmark = benchmark_performance.PerformanceBenchmark()
-        results = benchmark.benchmark_latency(num_requests=5)
+        with patch.object(benchmark, '_create_session', return_value=session):
+            results = benchmark.benchmark_latency(num_requests=5)
         
         assert "mean_latency_s" in results
         assert "median_latency_s" in results
@@ -65,71 +161,720 @@ class TestPerformanceBenchmark:
         assert "p99_latency_s" in results
         assert results["successful_requests"] == 5
         assert results["failed_requests"] == 0
+        assert results["pipeline_depth"] == 1
+        payload = _posted_json(session.post.call_args)
+        assert payload["model"] == "test-model"
+        assert payload["messages"][0]["content"] == benchmark_performance.SHARED_SYSTEM
+    
+    def test_sync_wrappers_accept_positional_arguments(self):
+        """Test the synchronous wrappers keep their explicit signatures."""
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, 'benchmark_latency_async', AsyncMock(return_value={})) as latency, \
+             patch.object(benchmark, 'benchmark_throughput_async', AsyncMock(return_value={})) as throughput:
+            benchmark.benchmark_latency(5, "Hi", 10)
+            benchmark.benchmark_throughput(2, "Hi", 10, 4)
+        
+        latency.assert_awaited_once_with(
+            num_requests=5, prompt="Hi", max_tokens=10, warmup=3, pipeline_depth=1
+        )
+        throughput.assert_awaited_once_with(
+            duration_seconds=2, prompt="Hi", max_tokens=10, concurrency=4, warmup=3
+        )
     
     @patch('benchmark_performance.CURCLLMClient')
     def test_latency_benchmark_with_errors(self, mock_client):
         """Test latency benchmark handles errors."""
-        # Mock client with some failures
-        mock_instance = Mock()
-        mock_instance.chat.side_effect = [
-            "Response 1",
+        # Mock session with some failures
+        session = _FakeSession([
+            _FakeResponse(_chat_payload("Response 1")),
             Exception("Error"),
-            "Response 2",
+            _FakeResponse(_chat_payload("Response 2")),
             Exception("Error"),
-            "Response 3"
-        ]
-        mock_client.return_value = mock_instance
+            _FakeResponse(_chat_payload("Response 3"))
+        ])
+        
+        mock_client.return_value._get_default_model.return_value = "test-model"
         
         benchmark = benchmark_performance.PerformanceBenchmark()
-        results = benchmark.benchmark_latency(num_requests=5)
+        with patch.object(benchmark, '_create_session', return_value=session):
+            results = benchmark.benchmark_latency(num_requests=5, warmup=0)
         
         assert results["successful_requests"] == 3
         assert results["failed_requests"] == 2
     
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_latency_benchmark_warmup_excluded(self, mock_client):
+        """Test warmup requests are sent but not measured."""
+        session = _FakeSession([
+            Exception("Cold start"),
+            _FakeResponse(_chat_payload("Warm")),
+            _FakeResponse(_chat_payload("Response 1")),
+            _FakeResponse(_chat_payload("Response 2"))
+        ])
+        
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_create_session', return_value=session):
+            results = benchmark.benchmark_latency(num_requests=2, warmup=2)
+        
+        assert session.post.call_count == 4
+        assert results["successful_requests"] == 2
+        assert results["failed_requests"] == 0
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_latency_benchmark_pipeline_depth(self, mock_client):
+        """Test pipelined latency benchmark completes every request."""
+        session = _FakeSession()
+        
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_create_session', return_value=session) as mock_session:
+            results = benchmark.benchmark_latency(
+                num_requests=12, warmup=0, pipeline_depth=4
+            )
+        
+        mock_session.assert_called_once_with(4)
+        assert session.post.call_count == 12
+        assert results["successful_requests"] == 12
+        assert results["pipeline_depth"] == 4
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_latency_benchmark_with_cache(self, mock_client):
+        """Test repeated prompts are served from the response cache."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        session = _FakeSession()
+        
+        benchmark = benchmark_performance.PerformanceBenchmark(
+            enable_cache=True, temperature=0.0
+        )
+        with patch.object(benchmark, '_create_session', return_value=session):
+            results = benchmark.benchmark_latency(num_requests=5, warmup=0)
+        
+        assert session.post.call_count == 1
+        assert results["successful_requests"] == 5
+        assert results["cache_hits"] == 4
+        assert results["cache_misses"] == 1
+        assert results["cache_hit_rate"] == 0.8
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_cache_bypassed_when_sampling(self, mock_client):
+        """Test sampled (temperature > 0) outputs are never replayed from cache."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        session = _FakeSession()
+        
+        benchmark = benchmark_performance.PerformanceBenchmark(enable_cache=True)
+        with patch.object(benchmark, '_create_session', return_value=session):
+            results = benchmark.benchmark_latency(num_requests=5, warmup=0)
+        
+        assert session.post.call_count == 5
+        assert results["cache_hits"] == 0
+        assert not benchmark._response_cache
+    
+    def test_cache_hit_yields_to_event_loop(self):
+        """Test a cache hit still suspends so other tasks get to run."""
+        benchmark = benchmark_performance.PerformanceBenchmark(
+            enable_cache=True, temperature=0.0
+        )
+        benchmark._cache_store(benchmark._cache_key("test-model", "Hello", 10), 5)
+        
+        async def hit():
+            ran = []
+            asyncio.get_running_loop().call_soon(ran.append, True)
+            tokens = await benchmark._post_chat(
+                _FakeSession(), "http://localhost:8000/v1/chat/completions",
+                "test-model", "Hello", 10
+            )
+            return tokens, ran
+        
+        assert asyncio.run(hit()) == (5, [True])
+    
+    def test_cache_key_distinguishes_parameters(self):
+        """Test cache keys differ when prompt or max_tokens change."""
+        benchmark = benchmark_performance.PerformanceBenchmark(enable_cache=True)
+        
+        key = benchmark._cache_key("model", "Hello", 10)
+        assert key == benchmark._cache_key("model", "Hello", 10)
+        assert key != benchmark._cache_key("model", "Hello!", 10)
+        assert key != benchmark._cache_key("model", "Hello", 20)
+        assert key != benchmark._cache_key("other-model", "Hello", 10)
+        
+        greedy = benchmark_performance.PerformanceBenchmark(temperature=0.0)
+        assert key != greedy._cache_key("model", "Hello", 10)
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test the response cache is bounded."""
+        benchmark = benchmark_performance.PerformanceBenchmark(enable_cache=True)
+        
+        with patch.object(benchmark_performance, 'CACHE_MAX_SIZE', 2):
+            benchmark._cache_store("a", 1)
+            benchmark._cache_store("b", 2)
+            benchmark._cache_lookup("a")
+            benchmark._cache_store("c", 3)
+        
+        assert "a" in benchmark._response_cache
+        assert "b" not in benchmark._response_cache
+        assert "c" in benchmark._response_cache
+    
     @patch('benchmark_performance.CURCLLMClient')
     @patch('benchmark_performance.time')
     def test_throughput_benchmark(self, mock_time, mock_client):
         """Test throughput benchmark."""
-        # Mock time to simulate duration
-        start_time = 1000.0
-        mock_time.time.side_effect = [
-            start_time,  # start
-            start_time,  # end_time calculation
-            start_time + 0.1,  # first iteration check
-            start_time + 0.2,  # second iteration check
-            start_time + 0.3,  # third iteration check
-            start_time + 1.1,  # exit loop (> duration)
-            start_time + 1.0,  # actual_duration calculation
-        ]
+        # Mock time to advance 0.1s per call so workers exit after ~1s
+        ticks = itertools.count()
+        mock_time.perf_counter_ns.side_effect = lambda: 10**12 + 10**8 * next(ticks)
         
-        # Mock client responses
         mock_instance = Mock()
-        mock_instance.chat.return_value = "Test response with multiple tokens"
+        mock_instance.base_url = "http://localhost:8000"
+        mock_instance.timeout = 60.0
+        mock_instance._get_default_model.return_value = "test-model"
+        mock_instance._get_headers.return_value = {}
         mock_client.return_value = mock_instance
         
+        async def yielding_post(*args):
+            # Suspend like a real request so workers interleave
+            await asyncio.sleep(0)
+            return 12
+        
         benchmark = benchmark_performance.PerformanceBenchmark()
-        results = benchmark.benchmark_throughput(duration_seconds=1)
+        with patch.object(benchmark, '_post_chat', AsyncMock(side_effect=yielding_post)) as mock_post:
+            results = benchmark.benchmark_throughput(
+                duration_seconds=1, concurrency=4, warmup=0
+            )
         
         assert "duration_s" in results
         assert "total_requests" in results
         assert "total_tokens" in results
         assert "requests_per_second" in results
         assert "tokens_per_second" in results
+        assert results["total_requests"] == mock_post.await_count
+        assert results["total_requests"] > 1
+        assert results["total_tokens"] == 12 * results["total_requests"]
+        assert results["concurrency"] == 4
         assert results["errors"] == 0
     
-    def test_percentile_edge_cases(self):
-        """Test percentile with edge cases."""
+    @patch('benchmark_performance.CURCLLMClient')
+    @patch('benchmark_performance.time')
+    def test_throughput_benchmark_with_errors(self, mock_time, mock_client):
+        """Test throughput benchmark counts failed requests."""
+        ticks = itertools.count()
+        mock_time.perf_counter_ns.side_effect = lambda: 10**12 + 10**8 * next(ticks)
+        
+        mock_instance = Mock()
+        mock_instance.base_url = "http://localhost:8000"
+        mock_instance.timeout = 60.0
+        mock_instance._get_headers.return_value = {}
+        mock_client.return_value = mock_instance
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        failing = AsyncMock(side_effect=Exception("Server error"))
+        with patch.object(benchmark, '_post_chat', failing):
+            results = benchmark.benchmark_throughput(
+                duration_seconds=1, concurrency=2, warmup=0
+            )
+        
+        assert results["total_requests"] == 0
+        assert results["errors"] == failing.await_count
+        assert results["avg_tokens_per_request"] == 0
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_throughput_progress_reported_off_request_path(self, mock_client, capsys):
+        """Test progress is printed by the background reporter once per second."""
+        async def slow_post(*args):
+            await asyncio.sleep(0.01)
+            return 5
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_create_session', return_value=_FakeSession()), \
+             patch.object(benchmark, '_post_chat', AsyncMock(side_effect=slow_post)):
+            results = benchmark.benchmark_throughput(
+                duration_seconds=1.2, concurrency=2, warmup=0
+            )
+        
+        progress_lines = [
+            line for line in capsys.readouterr().out.splitlines()
+            if "requests in" in line
+        ]
+        assert len(progress_lines) == 1
+        assert results["total_requests"] > 0
+    
+    def test_concurrent_request_parses_json(self):
+        """Test concurrent request reads content from the raw JSON response."""
+        session = _FakeSession()
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        result = asyncio.run(benchmark._concurrent_request(
+            session, "http://localhost:8000/v1/chat/completions",
+            "test-model", "Hello", 10, 0
+        ))
+        
+        assert result["success"] is True
+        assert result["tokens"] == 7
+        payload = _posted_json(session.post.call_args)
+        assert payload["model"] == "test-model"
+        assert payload["messages"][0]["content"] == benchmark_performance.SHARED_SYSTEM
+        assert payload["messages"][1] == {"role": "user", "content": "Hello"}
+        assert payload["max_tokens"] == 10
+    
+    def test_payload_serialized_once(self):
+        """Test identical requests reuse the same serialized body."""
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        
+        first = benchmark._payload("test-model", "Hello", 10)
+        assert benchmark._payload("test-model", "Hello", 10) is first
+        assert benchmark._payload("test-model", "Hello", 20) is not first
+        assert json.loads(first) == {
+            "model": "test-model",
+            "messages": [
+                {"role": "system", "content": benchmark_performance.SHARED_SYSTEM},
+                {"role": "user", "content": "Hello"}
+            ],
+            "temperature": benchmark_performance.TEMPERATURE,
+            "max_tokens": 10
+        }
+    
+    def test_post_chat_without_usage_defers_counting(self):
+        """Test responses lacking usage are tokenized after the timed section."""
+        session = _FakeSession([
+            _FakeResponse({"choices": [{"message": {"content": "one two three"}}]})
+        ])
+        encoding = Mock(ids=[1, 2, 3, 4])
+        tokenizer = Mock()
+        tokenizer.encode_batch.return_value = [encoding]
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        tokens = asyncio.run(benchmark._post_chat(
+            session, "http://localhost:8000/v1/chat/completions",
+            "test-model", "Hello", 10
+        ))
+        assert tokens == 0
+        
+        with patch.object(benchmark_performance, 'Tokenizer') as mock_tokenizer:
+            mock_tokenizer.from_pretrained.return_value = tokenizer
+            assert benchmark._count_deferred_tokens("test-model") == 4
+        
+        mock_tokenizer.from_pretrained.assert_called_once_with("test-model")
+        tokenizer.encode_batch.assert_called_once_with(
+            ["one two three"], add_special_tokens=False
+        )
+        assert benchmark._count_deferred_tokens("test-model") == 0
+    
+    def test_deferred_tokens_encode_repeats_once(self):
+        """Test identical responses are encoded once and reuse the count."""
+        tokenizer = Mock()
+        tokenizer.encode_batch.return_value = [Mock(ids=[1, 2]), Mock(ids=[1, 2, 3])]
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        benchmark._tokenizer = tokenizer
+        benchmark._untokenized = ["same", "other", "same"]
+        assert benchmark._count_deferred_tokens("test-model") == 7
+        
+        benchmark._untokenized = ["other", "other"]
+        assert benchmark._count_deferred_tokens("test-model") == 6
+        tokenizer.encode_batch.assert_called_once_with(
+            ["same", "other"], add_special_tokens=False
+        )
+    
+    def test_deferred_tokens_flushed_in_bounded_batches(self):
+        """Test pending responses are tokenized once a batch fills up."""
+        session = _FakeSession([
+            _FakeResponse({"choices": [{"message": {"content": "one two"}}]})
+            for _ in range(5)
+        ])
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        
+        async def post_all():
+            for _ in range(5):
+                await benchmark._post_chat(
+                    session, "http://localhost:8000/v1/chat/completions",
+                    "test-model", "Hello", 10
+                )
+            pending = (len(benchmark._untokenized), len(benchmark._token_futures))
+            return pending, await benchmark._drain_deferred_tokens("test-model")
+        
+        with patch.object(benchmark_performance, 'Tokenizer', None), \
+             patch.object(benchmark_performance, 'TOKENIZE_BATCH_SIZE', 2):
+            assert asyncio.run(post_all()) == ((1, 2), 10)
+        
+        assert benchmark._token_futures == []
+        assert benchmark._untokenized == []
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_tokenizer_never_runs_inside_timed_requests(self, mock_client):
+        """Test the tokenizer loads before timing and encodes off the event loop."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        session = _FakeSession([
+            _FakeResponse({"choices": [{"message": {"content": f"reply {i}"}}]})
+            for i in range(5)
+        ])
+        in_request = []
+        events = []
+        
+        def encode_batch(texts, **kwargs):
+            on_loop = threading.current_thread() is threading.main_thread()
+            events.append(("encode", on_loop and bool(in_request)))
+            return [Mock(ids=[1, 2, 3]) for _ in texts]
+        
+        def from_pretrained(model):
+            events.append(("load", session.post.call_count > 0))
+            return Mock(encode_batch=Mock(side_effect=encode_batch))
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        post_chat = benchmark._post_chat
+        
+        async def timed_post(*args):
+            in_request.append(True)
+            try:
+                return await post_chat(*args)
+            finally:
+                in_request.pop()
+        
+        with patch.object(benchmark, '_create_session', return_value=session), \
+             patch.object(benchmark, '_post_chat', timed_post), \
+             patch.object(benchmark_performance, 'Tokenizer') as mock_tokenizer, \
+             patch.object(benchmark_performance, 'TOKENIZE_BATCH_SIZE', 2):
+            mock_tokenizer.from_pretrained.side_effect = from_pretrained
+            results = benchmark.benchmark_concurrency(
+                num_concurrent=1, num_requests_per_client=5, warmup=0
+            )
+        
+        assert results["total_tokens"] == 15
+        assert events[0] == ("load", False)
+        assert [name for name, _ in events].count("encode") == 3
+        assert not any(during for _, during in events)
+    
+    def test_token_count_memo_is_bounded(self):
+        """Test memoized token counts are dropped once the memo fills up."""
+        tokenizer = Mock()
+        tokenizer.encode_batch.side_effect = lambda texts, **kwargs: [
+            Mock(ids=text.split()) for text in texts
+        ]
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        benchmark._tokenizer = tokenizer
+        
+        with patch.object(benchmark_performance, 'TOKEN_COUNT_CACHE_SIZE', 2):
+            benchmark._untokenized = ["a", "b c"]
+            assert benchmark._count_deferred_tokens("test-model") == 3
+            benchmark._untokenized = ["d e f", "a"]
+            assert benchmark._count_deferred_tokens("test-model") == 4
+        
+        assert benchmark._token_counts == {"d e f": 3, "a": 1}
+    
+    def test_deferred_tokens_without_tokenizers(self):
+        """Test deferred counting falls back to words without tokenizers."""
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        benchmark._untokenized = ["one two three", "four five"]
+        
+        with patch.object(benchmark_performance, 'Tokenizer', None):
+            assert benchmark._count_deferred_tokens("test-model") == 5
+    
+    def test_concurrent_request_error(self):
+        """Test concurrent request reports failures instead of raising."""
+        session = _FakeSession([Exception("Connection refused")])
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        result = asyncio.run(benchmark._concurrent_request(
+            session, "http://localhost:8000/v1/chat/completions",
+            "test-model", "Hello", 10, 3
+        ))
+        
+        assert result["success"] is False
+        assert result["request_id"] == 3
+        assert "Connection refused" in result["error"]
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_concurrency_benchmark(self, mock_client):
+        """Test concurrency benchmark aggregates results."""
+        mock_instance = Mock()
+        mock_instance.base_url = "http://localhost:8000"
+        mock_instance.timeout = 60.0
+        mock_instance._get_default_model.return_value = "test-model"
+        mock_instance._get_headers.return_value = {}
+        mock_client.return_value = mock_instance
+        
+        fake_request = AsyncMock(side_effect=lambda *args: {
+            "success": True, "latency": 0.1, "tokens": 3, "request_id": args[-1]
+        })
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_concurrent_request', fake_request):
+            results = benchmark.benchmark_concurrency(
+                num_concurrent=2,
+                num_requests_per_client=3,
+                warmup=0
+            )
+        
+        assert results["total_requests"] == 6
+        assert results["successful_requests"] == 6
+        assert results["total_tokens"] == 18
+        assert fake_request.await_count == 6
+    
+    def test_full_benchmark_writes_results(self, tmp_path):
+        """Test full benchmark saves JSON and removes the partial file."""
+        output_file = tmp_path / "results.json"
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, 'benchmark_latency', return_value={"mean_latency_s": 0.5}), \
+             patch.object(benchmark, 'benchmark_throughput', return_value={"total_requests": 3}), \
+             patch.object(benchmark, 'benchmark_concurrency', return_value={"total_requests": 6}):
+            results = benchmark.run_full_benchmark(output_file=str(output_file), quick=True)
+        
+        saved = json.loads(output_file.read_text())
+        assert saved == results
+        assert saved["status"] == "completed"
+        assert saved["latency"]["mean_latency_s"] == 0.5
+        assert not (tmp_path / "results.json.partial").exists()
+    
+    def test_full_benchmark_saves_failed_run(self, tmp_path):
+        """Test completed sections are kept when a later section fails."""
+        output_file = tmp_path / "results.json"
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, 'benchmark_latency', return_value={"mean_latency_s": 0.5}), \
+             patch.object(benchmark, 'benchmark_throughput', side_effect=Exception("Server down")):
+            benchmark.run_full_benchmark(output_file=str(output_file), quick=True)
+        
+        saved = json.loads(output_file.read_text())
+        assert saved["status"] == "failed"
+        assert saved["error"] == "Server down"
+        assert "latency" in saved
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_concurrency_benchmark_partial_failures(self, mock_client):
+        """Test concurrency benchmark aggregates successes and failures."""
+        def fake_result(*args):
+            request_id = args[-1]
+            if request_id % 4 == 0:
+                return {"success": False, "error": "Timeout", "latency": 1.0,
+                        "request_id": request_id}
+            return {"success": True, "latency": 0.2, "tokens": 5,
+                    "request_id": request_id}
+        
+        benchmark = benchmark_performance.PerformanceBenchmark()
+        with patch.object(benchmark, '_create_session', return_value=_FakeSession()), \
+             patch.object(benchmark, '_concurrent_request', AsyncMock(side_effect=fake_result)):
+            results = benchmark.benchmark_concurrency(
+                num_concurrent=4,
+                num_requests_per_client=5,
+                warmup=0
+            )
+        
+        assert results["total_requests"] == 20
+        assert results["successful_requests"] == 15
+        assert results["failed_requests"] == 5
+        assert results["total_tokens"] == 75
+    
+    def test_latency_stats_edge_cases(self):
+        """Test latency statistics with edge cases."""
         benchmark = benchmark_performance.PerformanceBenchmark()
         
         # Single value
-        assert benchmark._percentile([5], 50) == 5
+        stats = benchmark._latency_stats([5])
+        assert stats["median_latency_s"] == 5
+        assert stats["p99_latency_s"] == 5
+        assert stats["std_dev_s"] == 0.0
         
-        # Two values - 50% of 2 = index 1
-        assert benchmark._percentile([1, 2], 50) == 2
+        # Two values - median interpolates between them
+        assert benchmark._latency_stats([1, 2])["median_latency_s"] == 1.5
         
-        # Empty should not crash (though invalid input)
+        # Empty should not crash silently (though invalid input)
         with pytest.raises(IndexError):
-            benchmark._percentile([], 50)
+            benchmark._latency_stats([])
+
+
+class TestWorkload:
+    """Test suite for pre-generated benchmark workloads."""
+    
+    def test_random_workload_lengths(self):
+        """Test random prompts and output lengths respect the range ratio."""
+        workload = benchmark_performance.build_workload(
+            dataset_name="random",
+            num_prompts=50,
+            input_len=100,
+            output_len=20,
+            range_ratio=0.5
+        )
+        
+        assert len(workload) == 50
+        for prompt, max_tokens in workload:
+            assert 50 <= len(prompt.split()) <= 150
+            assert 10 <= max_tokens <= 30
+    
+    def test_random_workload_is_reproducible(self):
+        """Test the same seed produces the same workload."""
+        first = benchmark_performance.build_workload(num_prompts=5, input_len=10)
+        second = benchmark_performance.build_workload(num_prompts=5, input_len=10)
+        
+        assert first == second
+    
+    def test_random_workload_trimmed_to_token_length(self):
+        """Test random prompts are cut to an exact token length with a tokenizer."""
+        tokenizer = Mock()
+        # Two tokens per word, so untrimmed prompts would be twice too long
+        tokenizer.encode_batch.side_effect = lambda texts, **kwargs: [
+            Mock(ids=[f"{word}#{half}" for word in text.split() for half in (1, 2)])
+            for text in texts
+        ]
+        tokenizer.decode.side_effect = " ".join
+        
+        workload = benchmark_performance.build_workload(
+            num_prompts=3, input_len=10, tokenizer=tokenizer
+        )
+        
+        assert [len(prompt.split()) for prompt, _ in workload] == [10, 10, 10]
+        tokenizer.encode_batch.assert_called_once()
+    
+    def test_hf_workload(self):
+        """Test prompts are read from a HuggingFace dataset column."""
+        fake_datasets = Mock()
+        fake_datasets.load_dataset.return_value = {"question": ["Q1", "Q2"]}
+        
+        with patch.dict(sys.modules, {"datasets": fake_datasets}):
+            workload = benchmark_performance.build_workload(
+                dataset_name="hf",
+                num_prompts=3,
+                output_len=16
+            )
+        
+        assert workload == [("Q1", 16), ("Q2", 16), ("Q1", 16)]
+        fake_datasets.load_dataset.assert_called_once_with(
+            benchmark_performance.DEFAULT_HF_DATASET, split="train"
+        )
+    
+    def test_unknown_dataset(self):
+        """Test unknown dataset names are rejected."""
+        with pytest.raises(ValueError):
+            benchmark_performance.build_workload(dataset_name="sonnet")
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_benchmark_cycles_workload(self, mock_client):
+        """Test requests index into the workload instead of the fixed prompt."""
+        session = _FakeSession()
+        workload = [("short prompt", 8), ("long prompt", 64)]
+        
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        
+        benchmark = benchmark_performance.PerformanceBenchmark(
+            shared_prefix=False,
+            workload=workload
+        )
+        with patch.object(benchmark, '_create_session', return_value=session):
+            benchmark.benchmark_latency(num_requests=3, warmup=0)
+        
+        payloads = [_posted_json(call) for call in session.post.call_args_list]
+        assert [p["messages"][0]["content"] for p in payloads] == [
+            "short prompt", "long prompt", "short prompt"
+        ]
+        assert [p["max_tokens"] for p in payloads] == [8, 64, 8]
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_check_workload_rejects_oversized_requests(self, mock_client):
+        """Test prompt + max_tokens beyond max_model_len is rejected."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        benchmark = benchmark_performance.PerformanceBenchmark(
+            shared_prefix=False,
+            workload=[("x" * 400, 50)]
+        )
+        
+        with patch.object(benchmark_performance, 'Tokenizer', None):
+            benchmark.check_workload(max_model_len=4096)
+            with pytest.raises(ValueError, match="max_model_len is 128"):
+                benchmark.check_workload(max_model_len=128)
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_check_workload_counts_shared_prefix(self, mock_client):
+        """Test the shared system prompt counts against the server's limit."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        mock_client.return_value.get_models.return_value = [
+            {"id": "test-model", "max_model_len": 1024}
+        ]
+        workload = [("short prompt", 16)]
+        
+        with patch.object(benchmark_performance, 'Tokenizer', None):
+            benchmark_performance.PerformanceBenchmark(
+                shared_prefix=False, workload=workload
+            ).check_workload()
+            with pytest.raises(ValueError, match="shared prefix"):
+                benchmark_performance.PerformanceBenchmark(
+                    workload=workload
+                ).check_workload()
+    
+    @patch('benchmark_performance.CURCLLMClient')
+    def test_check_workload_skipped_without_server_limit(self, mock_client):
+        """Test the check is skipped when /v1/models omits max_model_len."""
+        mock_client.return_value._get_default_model.return_value = "test-model"
+        mock_client.return_value.get_models.return_value = [{"id": "test-model"}]
+        benchmark = benchmark_performance.PerformanceBenchmark(
+            workload=[("x" * 100000, 50)]
+        )
+        
+        benchmark.check_workload()
+
+
+class TestRunningStats:
+    """Test suite for single-pass latency statistics."""
+    
+    def test_mean_and_std_dev(self):
+        """Test Welford updates match batch statistics."""
+        stats = benchmark_performance.RunningStats()
+        for value in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]:
+            stats.update(value)
+        
+        assert stats.count == 10
+        assert stats.mean == pytest.approx(5.5)
+        assert stats.std_dev == pytest.approx(3.0277, abs=1e-4)
+    
+    def test_single_sample(self):
+        """Test statistics with one sample."""
+        stats = benchmark_performance.RunningStats()
+        stats.update(2.5)
+        
+        assert stats.mean == 2.5
+        assert stats.std_dev == 0.0
+    
+    def test_percentile_without_tdigest(self):
+        """Test percentiles are skipped when tdigest is not installed."""
+        with patch.object(benchmark_performance, 'TDigest', None):
+            stats = benchmark_performance.RunningStats()
+            stats.update(1.0)
+        
+        assert stats.percentile(99) is None
+    
+    def test_percentile_with_tdigest(self):
+        """Test percentiles come from the t-digest when available."""
+        digest = Mock()
+        digest.percentile.return_value = 9.9
+        with patch.object(benchmark_performance, 'TDigest', return_value=digest):
+            stats = benchmark_performance.RunningStats()
+            stats.update(1.0)
+        
+        assert stats.percentile(99) == 9.9
+        digest.update.assert_called_once_with(1.0)
+        digest.percentile.assert_called_once_with(99)
+
+
+class TestEventLoop:
+    """Test event loop selection for the async benchmarks."""
+    
+    def test_run_async_without_uvloop(self):
+        """Test the default asyncio loop is used when uvloop is missing."""
+        async def answer():
+            return 42
+        
+        with patch.object(benchmark_performance, 'uvloop', None):
+            assert benchmark_performance.run_async(answer()) == 42
+    
+    def test_run_async_with_uvloop(self):
+        """Test uvloop runs the coroutine when installed."""
+        fake_uvloop = Mock()
+        fake_uvloop.run.return_value = 42
+        coro = Mock()
+        
+        with patch.object(benchmark_performance, 'uvloop', fake_uvloop):
+            assert benchmark_performance.run_async(coro) == 42
+        
+        fake_uvloop.run.assert_called_once_with(coro)
 
 
 class TestBenchmarkConfiguration:
@@ -4,15 +4,23 @@ Tests for CURC LLM Client
 Author: Patrick Cooper
 """
 
+import asyncio
+import time
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import sys
 import os
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.client.curc_llm_client import CURCLLMClient, create_client
+from src.client.curc_llm_client import (
+    AsyncCURCLLMClient, CURCLLMClient, _ModelCache, create_client, get_shared_client
+)
+
+# Captured before the autouse fixture in conftest.py patches it out
+_real_get_default_model = CURCLLMClient._get_default_model
 
 
 class TestCURCLLMClient:
@@ -38,6 +46,49 @@ class TestCURCLLMClient:
         assert client.timeout == 30.0
         assert client.max_retries == 5
     
+    @patch('src.client.curc_llm_client.httpx.HTTPTransport')
+    def test_http_transport_configuration(self, mock_transport):
+        """Test the direct HTTP client pools connections and retries."""
+        CURCLLMClient(max_retries=5).http_client
+        
+        kwargs = mock_transport.call_args.kwargs
+        assert kwargs['retries'] == 5
+        assert kwargs['limits'].max_connections == 64
+        assert kwargs['limits'].max_keepalive_connections == 32
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_clients_created_lazily(self, mock_openai, mock_httpx):
+        """Test underlying clients are built on first use and closed only if built."""
+        client = CURCLLMClient()
+        mock_openai.assert_not_called()
+        mock_httpx.assert_not_called()
+        
+        assert client.http_client is client.http_client
+        mock_httpx.assert_called_once()
+        
+        client.close()
+        mock_httpx.return_value.close.assert_called_once()
+        mock_openai.assert_not_called()
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_warmup_opens_connections(self, mock_openai, mock_httpx):
+        """Test warmup touches both connection pools at construction."""
+        CURCLLMClient(warmup=True)
+        
+        mock_httpx.return_value.get.assert_called_once_with("http://localhost:8000/health")
+        mock_openai.return_value.models.list.assert_called_once()
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_warmup_ignores_unavailable_server(self, mock_httpx):
+        """Test warmup does not raise while the server is down."""
+        import httpx
+        mock_httpx.return_value.get.side_effect = httpx.ConnectError("refused")
+        
+        client = CURCLLMClient()
+        client.warmup()
+    
     def test_get_headers_without_api_key(self):
         """Test header generation without API key."""
         client = CURCLLMClient()
@@ -85,6 +136,50 @@ class TestCURCLLMClient:
         assert messages[0]['content'] == 'You are a helpful assistant.'
         assert messages[1]['role'] == 'user'
     
+    def test_build_messages_reuses_system_message(self):
+        """Test the system message dict is built once per prompt."""
+        client = CURCLLMClient()
+        
+        first = client._build_messages("Hi", "Be brief.")
+        second = client._build_messages("Bye", "Be brief.")
+        
+        assert first[0] is second[0]
+        assert second[1] == {"role": "user", "content": "Bye"}
+        assert client._build_messages("Hi", None) == (
+            {"role": "user", "content": "Hi"},
+        )
+    
+    def test_system_message_cache_is_bounded(self):
+        """Test the least recently used system message is evicted when full."""
+        client = CURCLLMClient()
+        
+        with patch('src.client.curc_llm_client.SYSTEM_MESSAGE_CACHE_MAX_SIZE', 2):
+            client._build_messages("Hi", "a")
+            client._build_messages("Hi", "b")
+            client._build_messages("Hi", "a")
+            client._build_messages("Hi", "c")
+        
+        assert list(client._sys_cache) == ["a", "c"]
+    
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_samples(self, mock_openai):
+        """Test multiple samples come back from one request."""
+        mock_response = Mock()
+        mock_response.choices = [
+            Mock(message=Mock(content="One")),
+            Mock(message=Mock(content="Two")),
+            Mock(message=Mock(content="Three")),
+        ]
+        mock_create = mock_openai.return_value.chat.completions.create
+        mock_create.return_value = mock_response
+        
+        client = CURCLLMClient()
+        samples = client.chat_samples("Name a color", n=3)
+        
+        assert samples == ["One", "Two", "Three"]
+        mock_create.assert_called_once()
+        assert mock_create.call_args.kwargs['n'] == 3
+    
     @patch('src.client.curc_llm_client.OpenAI')
     def test_chat_stream(self, mock_openai):
         """Test streaming chat."""
@@ -136,6 +231,89 @@ class TestCURCLLMClient:
         # Should skip None chunks
         assert chunks == ["Hello", " world"]
     
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_stream_to_callback(self, mock_openai):
+        """Test chat streams chunks to a callback and returns the full text."""
+        mock_chunks = [
+            Mock(choices=[Mock(delta=Mock(content="Hello"))]),
+            Mock(choices=[Mock(delta=Mock(content=None))]),
+            Mock(choices=[Mock(delta=Mock(content=" world"))]),
+        ]
+        mock_create = mock_openai.return_value.chat.completions.create
+        mock_create.return_value = iter(mock_chunks)
+        received = []
+        
+        client = CURCLLMClient()
+        response = client.chat("Hi", stream_to=received.append)
+        
+        assert response == "Hello world"
+        assert received == ["Hello", " world"]
+        assert mock_create.call_args.kwargs['stream'] is True
+    
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_always_stream(self, mock_openai):
+        """Test always_stream makes chat stream without a callback."""
+        mock_chunks = [Mock(choices=[Mock(delta=Mock(content="Streamed"))])]
+        mock_create = mock_openai.return_value.chat.completions.create
+        mock_create.return_value = iter(mock_chunks)
+        
+        client = CURCLLMClient(always_stream=True)
+        
+        assert client.chat("Hi") == "Streamed"
+        assert mock_create.call_args.kwargs['stream'] is True
+    
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_stream_collected(self, mock_openai):
+        """Test collected streaming returns full text and time to first chunk."""
+        mock_chunks = [
+            Mock(choices=[Mock(delta=Mock(content="Hello"))]),
+            Mock(choices=[Mock(delta=Mock(content=" world"))]),
+        ]
+        mock_openai.return_value.chat.completions.create.return_value = iter(mock_chunks)
+        
+        client = CURCLLMClient()
+        text, ttft = client.chat_stream_collected("Hi", max_tokens=10)
+        
+        assert text == "Hello world"
+        assert ttft is not None and ttft >= 0.0
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_raw(self, mock_openai, mock_httpx):
+        """Test raw chat posts directly and skips the SDK."""
+        mock_httpx.return_value.post.return_value.content = (
+            b'{"choices": [{"message": {"content": "Raw reply"}}]}'
+        )
+        
+        client = CURCLLMClient()
+        response = client.chat("Hi", max_tokens=5, raw=True)
+        
+        assert response == "Raw reply"
+        mock_openai.return_value.chat.completions.create.assert_not_called()
+        call_args = mock_httpx.return_value.post.call_args
+        assert call_args.args[0] == "http://localhost:8000/v1/chat/completions"
+        assert call_args.kwargs['json']['max_tokens'] == 5
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_chat_stream_raw(self, mock_httpx):
+        """Test raw streaming parses server-sent events."""
+        response = MagicMock()
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            '',
+            'data: {"choices": [{"delta": {"content": "Hello"}}]}',
+            'data: {"choices": [{"delta": {"content": " world"}}]}',
+            'data: {"choices": []}',
+            'data: [DONE]',
+        ]
+        mock_httpx.return_value.stream.return_value.__enter__.return_value = response
+        
+        client = CURCLLMClient()
+        chunks = list(client.chat_stream("Hi", raw=True))
+        
+        assert chunks == ["Hello", " world"]
+        assert mock_httpx.return_value.stream.call_args.kwargs['json']['stream'] is True
+    
     @patch('src.client.curc_llm_client.OpenAI')
     def test_complete(self, mock_openai):
         """Test completion generation."""
@@ -148,6 +326,21 @@ class TestCURCLLMClient:
         
         assert response == "bright and full of possibilities."
     
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_complete_batch(self, mock_openai):
+        """Test batched completion sends one request and keeps prompt order."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(index=1, text="B"), Mock(index=0, text="A")]
+        mock_create = mock_openai.return_value.completions.create
+        mock_create.return_value = mock_response
+        
+        client = CURCLLMClient()
+        results = client.complete_batch(["first", "second"])
+        
+        assert results == ["A", "B"]
+        mock_create.assert_called_once()
+        assert mock_create.call_args.kwargs['prompt'] == ["first", "second"]
+    
     @patch('src.client.curc_llm_client.OpenAI')
     def test_complete_stream(self, mock_openai):
         """Test streaming completion."""
@@ -220,12 +413,10 @@ class TestCURCLLMClient:
     def test_get_models(self, mock_httpx):
         """Test get models endpoint."""
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": [
-                {"id": "model1", "object": "model"},
-                {"id": "model2", "object": "model"}
-            ]
-        }
+        mock_response.content = (
+            b'{"data": [{"id": "model1", "object": "model"},'
+            b' {"id": "model2", "object": "model"}]}'
+        )
         mock_httpx.return_value.get.return_value = mock_response
         
         client = CURCLLMClient()
@@ -234,6 +425,18 @@ class TestCURCLLMClient:
         assert len(models) == 2
         assert models[0]["id"] == "model1"
     
+    @patch('src.client.curc_llm_client.orjson', None)
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_get_models_without_orjson(self, mock_httpx):
+        """Test model listing falls back to the stdlib JSON decoder."""
+        mock_httpx.return_value.get.return_value.json.return_value = {
+            "data": [{"id": "model1", "object": "model"}]
+        }
+        
+        client = CURCLLMClient()
+        
+        assert client.get_models() == [{"id": "model1", "object": "model"}]
+    
     def test_context_manager(self):
         """Test client can be used as context manager."""
         with CURCLLMClient() as client:
@@ -246,6 +449,93 @@ class TestCURCLLMClient:
         assert client.base_url == "http://test:8000"
         assert client.api_key == "key"
     
+    def test_get_shared_client(self):
+        """Test shared clients are reused per configuration."""
+        first = get_shared_client(base_url="http://shared:8000/")
+        
+        assert get_shared_client(base_url="http://shared:8000") is first
+        assert get_shared_client(base_url="http://shared:8000", timeout=5.0) is not first
+        assert isinstance(first, CURCLLMClient)
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_shared_client_stays_open_for_other_holders(self, mock_httpx):
+        """Test one holder closing a shared client leaves it open for the rest."""
+        first = get_shared_client(base_url="http://shared-close:8000")
+        second = get_shared_client(base_url="http://shared-close:8000")
+        first.http_client
+        
+        with first:
+            pass
+        second.close()
+        
+        # Still cached for reuse, so releasing every holder keeps it open
+        mock_httpx.return_value.close.assert_not_called()
+        assert get_shared_client(base_url="http://shared-close:8000") is first
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_evicted_shared_client_closed_by_last_holder(self, mock_httpx):
+        """Test an evicted client stays open until its last holder releases it."""
+        first_http, second_http = Mock(), Mock()
+        mock_httpx.side_effect = [first_http, second_http]
+        
+        with patch('src.client.curc_llm_client.SHARED_CLIENT_MAX_SIZE', 1):
+            first = get_shared_client(base_url="http://evict-a:8000")
+            first.http_client
+            second = get_shared_client(base_url="http://evict-b:8000")
+            second.http_client
+        
+        first_http.close.assert_not_called()
+        first.close()
+        first_http.close.assert_called_once()
+        second_http.close.assert_not_called()
+        assert get_shared_client(base_url="http://evict-b:8000") is second
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_released_shared_client_closed_on_eviction(self, mock_httpx):
+        """Test a shared client nobody holds is closed as soon as it is evicted."""
+        first_http = Mock()
+        mock_httpx.side_effect = [first_http]
+        
+        with patch('src.client.curc_llm_client.SHARED_CLIENT_MAX_SIZE', 1):
+            first = get_shared_client(base_url="http://evict-c:8000")
+            first.http_client
+            first.close()
+            first_http.close.assert_not_called()
+            get_shared_client(base_url="http://evict-d:8000")
+        
+        first_http.close.assert_called_once()
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_lazy_clients_built_once_across_threads(self, mock_httpx):
+        """Test concurrent first access builds a single httpx client."""
+        def slow_client(*args, **kwargs):
+            time.sleep(0.01)
+            return Mock()
+        mock_httpx.side_effect = slow_client
+        client = CURCLLMClient()
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            built = list(pool.map(lambda _: client.http_client, range(8)))
+        
+        assert mock_httpx.call_count == 1
+        assert all(http is built[0] for http in built)
+    
+    def test_response_cache_safe_across_threads(self):
+        """Test concurrent cache reads and evictions do not race."""
+        client = CURCLLMClient()
+        
+        def churn(offset):
+            for i in range(2000):
+                key = ("chat", (offset + i) % 8)
+                client._cache_put(key, "value")
+                client._cache_get(("chat", (offset + i + 1) % 8))
+        
+        with patch('src.client.curc_llm_client.RESPONSE_CACHE_MAX_SIZE', 4), \
+             ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(churn, range(4)))
+        
+        assert len(client._resp_cache) <= 4
+    
     @patch('src.client.curc_llm_client.httpx.Client')
     def test_health_check_error(self, mock_httpx):
         """Test health check with server error."""
@@ -309,6 +599,195 @@ class TestCURCLLMClient:
         assert call_args.kwargs['max_tokens'] == 1000
         assert call_args.kwargs['top_p'] == 0.9
         assert call_args.kwargs['frequency_penalty'] == 0.5
+    
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_chat_caches_deterministic_responses(self, mock_openai):
+        """Test temperature-0 chats are served from the cache on repeat."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Cached"))]
+        mock_create = mock_openai.return_value.chat.completions.create
+        mock_create.return_value = mock_response
+        
+        client = CURCLLMClient()
+        assert client.chat("Hi", temperature=0.0) == "Cached"
+        assert client.chat("Hi", temperature=0.0) == "Cached"
+        assert mock_create.call_count == 1
+        
+        client.chat("Hi", temperature=0.0, cache=False)
+        client.chat("Hi", temperature=0.7)
+        assert mock_create.call_count == 3
+        
+        client.cache_clear()
+        client.chat("Hi", temperature=0.0)
+        assert mock_create.call_count == 4
+    
+    @patch('src.client.curc_llm_client.OpenAI')
+    def test_complete_cache_keys_on_parameters(self, mock_openai):
+        """Test completions with different parameters are cached separately."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(text="Result")]
+        mock_create = mock_openai.return_value.completions.create
+        mock_create.return_value = mock_response
+        
+        client = CURCLLMClient()
+        client.complete("Test", temperature=0.0, max_tokens=10)
+        client.complete("Test", temperature=0.0, max_tokens=20)
+        client.complete("Test", temperature=0.0, max_tokens=10)
+        client.complete("Test", temperature=0.0, stop=["\n"])
+        client.complete("Test", temperature=0.0, stop=["\n"])
+        
+        # Unhashable kwargs (the stop list) bypass the cache
+        assert mock_create.call_count == 4
+    
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_default_model_shared_across_instances(self, mock_httpx):
+        """Test /v1/models is fetched once per server, not once per client."""
+        _ModelCache.clear()
+        mock_httpx.return_value.get.return_value.content = (
+            b'{"data": [{"id": "shared-model"}]}'
+        )
+        
+        try:
+            first = _real_get_default_model(CURCLLMClient())
+            second = _real_get_default_model(CURCLLMClient())
+            other = _real_get_default_model(CURCLLMClient(base_url="http://other:8000"))
+        finally:
+            _ModelCache.clear()
+        
+        assert first == second == other == "shared-model"
+        assert mock_httpx.return_value.get.call_count == 2
+    
+    @patch('src.client.curc_llm_client.time.monotonic')
+    @patch('src.client.curc_llm_client.httpx.Client')
+    def test_default_model_cache_expires(self, mock_httpx, mock_monotonic):
+        """Test the shared model cache refetches after the TTL."""
+        _ModelCache.clear()
+        mock_httpx.return_value.get.return_value.content = (
+            b'{"data": [{"id": "shared-model"}]}'
+        )
+        mock_monotonic.side_effect = [0.0, 10.0, 400.0, 400.0]
+        
+        client = CURCLLMClient()
+        try:
+            for _ in range(3):
+                _real_get_default_model(client)
+        finally:
+            _ModelCache.clear()
+        
+        assert mock_httpx.return_value.get.call_count == 2
+
+
+class TestAsyncCURCLLMClient:
+    """Test suite for AsyncCURCLLMClient."""
+    
+    @patch('src.client.curc_llm_client.httpx.AsyncHTTPTransport')
+    def test_http_transport_retries(self, mock_transport):
+        """Test the async HTTP client retries failed connections."""
+        AsyncCURCLLMClient(max_retries=4)
+        
+        assert mock_transport.call_args.kwargs['retries'] == 4
+    
+    @patch('src.client.curc_llm_client.AsyncOpenAI')
+    def test_achat_simple(self, mock_openai):
+        """Test awaited chat returns the message content."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Hello!"))]
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        
+        client = AsyncCURCLLMClient()
+        response = asyncio.run(client.achat("Hi", system_prompt="Be brief."))
+        
+        assert response == "Hello!"
+        call_args = mock_openai.return_value.chat.completions.create.call_args
+        assert call_args.kwargs['model'] == "test-model/unit-test"
+        assert call_args.kwargs['messages'][0]['role'] == 'system'
+    
+    @patch('src.client.curc_llm_client.AsyncOpenAI')
+    def test_achat_stream(self, mock_openai):
+        """Test async streaming skips empty chunks."""
+        async def stream():
+            for content in ["Hello", None, " world"]:
+                yield Mock(choices=[Mock(delta=Mock(content=content))])
+        
+        mock_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=stream()
+        )
+        
+        async def collect():
+            client = AsyncCURCLLMClient()
+            return [chunk async for chunk in client.achat_stream("Hi")]
+        
+        assert asyncio.run(collect()) == ["Hello", " world"]
+    
+    @patch('src.client.curc_llm_client.AsyncOpenAI')
+    def test_acomplete(self, mock_openai):
+        """Test awaited completion returns the choice text."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(text="42")]
+        mock_openai.return_value.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        
+        client = AsyncCURCLLMClient()
+        
+        assert asyncio.run(client.acomplete("The answer is", model="m")) == "42"
+    
+    def test_achat_aiohttp_bypasses_sdk(self):
+        """Test use_aiohttp posts the chat directly instead of via the SDK."""
+        response = MagicMock()
+        response.json = AsyncMock(
+            return_value={"choices": [{"message": {"content": "Raw reply"}}]}
+        )
+        session = MagicMock()
+        session.post.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = AsyncMock(return_value=False)
+        
+        client = AsyncCURCLLMClient(use_aiohttp=True)
+        with patch.object(client, '_get_session', return_value=session), \
+                patch.object(client.openai_client.chat.completions, 'create') as sdk:
+            reply = asyncio.run(client.achat("Hi", max_tokens=5))
+        
+        assert reply == "Raw reply"
+        sdk.assert_not_called()
+        url = session.post.call_args.args[0]
+        payload = session.post.call_args.kwargs['json']
+        assert url == "http://localhost:8000/v1/chat/completions"
+        assert payload['model'] == "test-model/unit-test"
+        assert payload['max_tokens'] == 5
+    
+    def test_use_aiohttp_requires_aiohttp(self):
+        """Test a clear error when the aiohttp extra is missing."""
+        with patch('src.client.curc_llm_client.aiohttp', None):
+            with pytest.raises(ImportError, match="aiohttp"):
+                AsyncCURCLLMClient(use_aiohttp=True)
+    
+    def test_chat_many_bounds_concurrency(self):
+        """Test chat_many keeps order, caps in-flight requests and keeps errors."""
+        client = AsyncCURCLLMClient()
+        in_flight = 0
+        peak = 0
+        
+        async def fake_achat(message, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if message == "bad":
+                raise RuntimeError("boom")
+            return message.upper()
+        
+        with patch.object(client, 'achat', side_effect=fake_achat):
+            results = asyncio.run(
+                client.chat_many(["a", "bad", "c", "d", "e"], concurrency=2)
+            )
+        
+        assert results[0] == "A"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2:] == ["C", "D", "E"]
+        assert peak == 2
 
 
 class TestClientIntegration:
@@ -9,51 +9,30 @@ Tests that example scripts can be imported and have correct structure.
 import pytest
 import sys
 import os
-from unittest.mock import patch, Mock
-from io import StringIO
+from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+_EXPECTED_PRESETS = frozenset({
+    'default', 'medium', 'large', 'xlarge',
+    'quantized', 'batch', 'interactive', 'dev'
+})
+
 
 class TestExampleScripts:
     """Test example scripts structure and imports."""
     
-    def test_basic_chat_imports(self):
-        """Test basic_chat.py can be imported."""
-        # Import the example as a module
+    @pytest.mark.parametrize("name,path", [
+        ("basic_chat", "examples/basic_chat.py"),
+        ("streaming_chat", "examples/streaming_chat.py"),
+        ("interactive_chat", "examples/interactive_chat.py"),
+    ])
+    def test_example_importable(self, name, path):
+        """Test each example script can be loaded as a module."""
         import importlib.util
-        spec = importlib.util.spec_from_file_location(
-            "basic_chat",
-            "examples/basic_chat.py"
-        )
-        module = importlib.util.module_from_spec(spec)
+        spec = importlib.util.spec_from_file_location(name, path)
         
-        # Should not raise ImportError
-        assert module is not None
-        assert hasattr(spec.loader, 'exec_module')
-    
-    def test_streaming_chat_imports(self):
-        """Test streaming_chat.py can be imported."""
-        import importlib.util
-        spec = importlib.util.spec_from_file_location(
-            "streaming_chat",
-            "examples/streaming_chat.py"
-        )
-        module = importlib.util.module_from_spec(spec)
-        
-        assert module is not None
-        assert hasattr(spec.loader, 'exec_module')
-    
-    def test_interactive_chat_imports(self):
-        """Test interactive_chat.py can be imported."""
-        import importlib.util
-        spec = importlib.util.spec_from_file_location(
-            "interactive_chat",
-            "examples/interactive_chat.py"
-        )
-        module = importlib.util.module_from_spec(spec)
-        
-        assert module is not None
+        assert spec is not None
         assert hasattr(spec.loader, 'exec_module')
 
 
@@ -84,157 +63,63 @@ class TestClientImportPaths:
 class TestConfigurationFiles:
     """Test configuration files are valid."""
     
-    def test_server_config_yaml_exists(self):
+    def test_server_config_yaml_exists(self, server_config):
         """Test server config file exists and is readable."""
-        import yaml
-        
-        with open('config/server_config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
-        
-        assert config is not None
-        assert 'default' in config
-        assert 'model' in config['default']
+        assert server_config is not None
+        assert 'default' in server_config
+        assert 'model' in server_config['default']
     
-    def test_server_config_has_all_presets(self):
+    def test_server_config_has_all_presets(self, server_config):
         """Test server config has all expected presets."""
-        import yaml
-        
-        with open('config/server_config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
-        
-        expected_presets = [
-            'default', 'medium', 'large', 'xlarge',
-            'quantized', 'batch', 'interactive', 'dev'
-        ]
-        
-        for preset in expected_presets:
-            assert preset in config, f"Missing preset: {preset}"
-    
-    def test_env_example_exists(self):
-        """Test .env.example file exists."""
-        assert os.path.exists('config/.env.example')
-        
-        with open('config/.env.example', 'r') as f:
-            content = f.read()
-        
-        # Check for key variables
-        assert 'CURC_USER' in content
-        assert 'MODEL_NAME' in content
-        assert 'HF_TOKEN' in content
+        missing = _EXPECTED_PRESETS - server_config.keys()
+        assert not missing, f"Missing presets: {sorted(missing)}"
 
 
 class TestDocumentation:
     """Test README is the single documentation source."""
 
-    def test_readme_exists(self):
-        """Test README.md exists and contains required sections."""
-        assert os.path.exists('README.md')
-
-        with open('README.md', 'r') as f:
-            content = f.read()
-
-        assert len(content) > 0
-        assert 'CURC' in content
-
-    def test_readme_covers_setup(self):
-        """Test README covers CURC setup instructions."""
-        with open('README.md', 'r') as f:
-            content = f.read()
-
-        assert 'sbatch' in content
-        assert 'SSH' in content or 'ssh' in content
-
-    def test_readme_covers_models(self):
-        """Test README documents model options."""
-        with open('README.md', 'r') as f:
-            content = f.read()
-
-        assert 'Qwen' in content
-
-    def test_readme_covers_troubleshooting(self):
-        """Test README has a troubleshooting section."""
-        with open('README.md', 'r') as f:
-            content = f.read()
-
-        assert 'Troubleshooting' in content or 'troubleshooting' in content
-
-    def test_readme_covers_storage(self):
-        """Test README documents storage guidelines."""
-        with open('README.md', 'r') as f:
-            content = f.read()
-
-        assert 'scratch' in content or '/scratch' in content
-
-
-class TestScripts:
-    """Test deployment scripts exist and are executable."""
-    
-    def test_setup_environment_script_exists(self):
-        """Test setup_environment.sh exists."""
-        assert os.path.exists('scripts/setup_environment.sh')
-
-        # Executable bit only meaningful on POSIX systems
+    @pytest.mark.parametrize("path,needle", [
+        ('README.md', b'CURC'),
+        ('README.md', b'sbatch'),        # CURC setup
+        ('README.md', b'SSH'),           # tunnel instructions
+        ('README.md', b'Qwen'),          # model options
+        ('README.md', b'Troubleshooting'),
+        ('README.md', b'scratch'),       # storage guidelines
+    ])
+    def test_doc_contains(self, doc_bytes, path, needle):
+        """Test documentation covers each required topic."""
+        assert needle in doc_bytes[path]
+
+
+class TestProjectFiles:
+    """Test deployment scripts and project files exist with expected content."""
+
+    @pytest.mark.parametrize("path,needles,exe", [
+        ('scripts/setup_environment.sh', (), True),
+        ('scripts/launch_vllm.slurm', (b'#!/bin/bash', b'#SBATCH'), False),
+        ('scripts/create_tunnel.sh', (), True),
+        ('requirements.txt', (b'vllm', b'openai', b'httpx'), False),
+        ('setup.py', (b'setup(', b'name='), False),
+        ('pytest.ini', (b'[pytest]',), False),
+        ('config/.env.example', (b'CURC_USER', b'MODEL_NAME', b'HF_TOKEN'), False),
+    ])
+    def test_file(self, doc_bytes, path, needles, exe):
+        """Test each file is a regular file, optionally executable and containing needles."""
         import stat
         import platform
-        if platform.system() != "Windows":
-            st = os.stat('scripts/setup_environment.sh')
-            assert st.st_mode & stat.S_IXUSR
-    
-    def test_launch_vllm_script_exists(self):
-        """Test launch_vllm.slurm exists."""
-        assert os.path.exists('scripts/launch_vllm.slurm')
-        
-        with open('scripts/launch_vllm.slurm', 'r') as f:
-            content = f.read()
-        
-        assert '#!/bin/bash' in content
-        assert '#SBATCH' in content
-    
-    def test_create_tunnel_script_exists(self):
-        """Test create_tunnel.sh exists."""
-        assert os.path.exists('scripts/create_tunnel.sh')
+
+        # One stat call covers existence, file type and the executable bit
+        st = os.stat(path)
+        assert stat.S_ISREG(st.st_mode)
 
         # Executable bit only meaningful on POSIX systems
-        import stat
-        import platform
-        if platform.system() != "Windows":
-            st = os.stat('scripts/create_tunnel.sh')
+        if exe and platform.system() != "Windows":
             assert st.st_mode & stat.S_IXUSR
 
-
-class TestRequirements:
-    """Test requirements and dependencies."""
-    
-    def test_requirements_file_exists(self):
-        """Test requirements.txt exists."""
-        assert os.path.exists('requirements.txt')
-        
-        with open('requirements.txt', 'r') as f:
-            requirements = f.read()
-        
-        # Check for key dependencies
-        assert 'vllm' in requirements
-        assert 'openai' in requirements
-        assert 'httpx' in requirements
-    
-    def test_setup_py_exists(self):
-        """Test setup.py exists."""
-        assert os.path.exists('setup.py')
-        
-        with open('setup.py', 'r') as f:
-            content = f.read()
-        
-        assert 'setup(' in content
-        assert 'name=' in content
-    
-    def test_pytest_ini_exists(self):
-        """Test pytest.ini exists."""
-        assert os.path.exists('pytest.ini')
-        
-        with open('pytest.ini', 'r') as f:
-            content = f.read()
-        
-        assert '[pytest]' in content
+        if needles:
+            content = doc_bytes[path] if path in doc_bytes else Path(path).read_bytes()
+            for needle in needles:
+                assert needle in content
 
 
 if __name__ == "__main__":
@@ -6,7 +6,9 @@ Author: Patrick Cooper
 Tests parameter validation, error handling, and edge cases.
 """
 
+import functools
 import pytest
+from types import SimpleNamespace as NS
 from unittest.mock import Mock, patch
 import sys
 import os
@@ -15,154 +17,129 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.client.curc_llm_client import CURCLLMClient
 
+_LONG_MESSAGE = "test " * 1000
+_SPECIAL_MESSAGE = "Test!@#$%^&*()_+-=[]{}|;':\",./<>?\n\t\r"
+_UNICODE_MESSAGE = "Hello 世界 🌍 こんにちは Здравствуй"
+_MSGS = tuple(f"Message {i}" for i in range(10))
+
+
+@functools.lru_cache(maxsize=8)
+def _chat_response(content):
+    """Shared read-only chat completion stub with the given message content."""
+    return NS(choices=[NS(message=NS(content=content))])
+
+
+@pytest.fixture
+def mock_client():
+    """Client whose OpenAI and httpx clients are mocks, so no network is touched."""
+    with patch('src.client.curc_llm_client.httpx.Client'), \
+         patch('src.client.curc_llm_client.OpenAI'):
+        yield CURCLLMClient()
+
 
 class TestParameterValidation:
     """Test parameter validation and edge cases."""
     
-    def test_empty_message(self):
+    def test_empty_message(self, mock_client):
         """Test chat with empty message."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat("")
+            response = mock_client.chat("")
             assert response == "Response"
     
-    def test_very_long_message(self):
+    def test_very_long_message(self, mock_client):
         """Test chat with very long message."""
-        client = CURCLLMClient()
-        long_message = "test " * 1000
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat(long_message)
+            response = mock_client.chat(_LONG_MESSAGE)
             assert response == "Response"
     
-    def test_special_characters_in_message(self):
+    def test_special_characters_in_message(self, mock_client):
         """Test chat with special characters."""
-        client = CURCLLMClient()
-        special_message = "Test!@#$%^&*()_+-=[]{}|;':\",./<>?\n\t\r"
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat(special_message)
+            response = mock_client.chat(_SPECIAL_MESSAGE)
             assert response == "Response"
     
-    def test_unicode_characters(self):
+    def test_unicode_characters(self, mock_client):
         """Test chat with unicode characters."""
-        client = CURCLLMClient()
-        unicode_message = "Hello 世界 🌍 こんにちは Здравствуй"
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat(unicode_message)
+            response = mock_client.chat(_UNICODE_MESSAGE)
             assert response == "Response"
     
-    def test_extreme_temperature_values(self):
-        """Test chat with boundary temperature values."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
-            
-            # Minimum temperature
-            client.chat("Test", temperature=0.0)
-            assert mock_create.call_args.kwargs['temperature'] == 0.0
-            
-            # Maximum temperature
-            client.chat("Test", temperature=2.0)
-            assert mock_create.call_args.kwargs['temperature'] == 2.0
-    
-    def test_zero_max_tokens(self):
-        """Test chat with zero max_tokens."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content=""))]
-            mock_create.return_value = mock_response
+    @pytest.mark.parametrize("temperature", [0.0, 2.0])
+    def test_temperature_boundary(self, mock_client, temperature):
+        """Test chat passes boundary temperature values through."""
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat("Test", max_tokens=0)
-            assert mock_create.call_args.kwargs['max_tokens'] == 0
+            mock_client.chat("Test", temperature=temperature)
+            assert mock_create.call_args.kwargs['temperature'] == temperature
     
-    def test_very_large_max_tokens(self):
-        """Test chat with very large max_tokens."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+    @pytest.mark.parametrize("max_tokens", [0, 100000])
+    def test_max_tokens_boundary(self, mock_client, max_tokens):
+        """Test chat passes boundary max_tokens values through."""
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            response = client.chat("Test", max_tokens=100000)
-            assert mock_create.call_args.kwargs['max_tokens'] == 100000
+            mock_client.chat("Test", max_tokens=max_tokens)
+            assert mock_create.call_args.kwargs['max_tokens'] == max_tokens
 
 
 class TestErrorHandling:
     """Test error handling scenarios."""
     
-    @patch('src.client.curc_llm_client.httpx.Client')
-    def test_network_timeout(self, mock_httpx):
+    @pytest.fixture(autouse=True)
+    def _patched(self):
+        """Build one client per test against mocked httpx and OpenAI clients."""
+        with patch('src.client.curc_llm_client.httpx.Client') as mock_httpx, \
+             patch('src.client.curc_llm_client.OpenAI'):
+            self.mock_httpx = mock_httpx
+            self.client = CURCLLMClient()
+            yield
+    
+    def test_network_timeout(self):
         """Test handling of network timeout."""
         import httpx
-        mock_httpx.return_value.get.side_effect = httpx.TimeoutException("Timeout")
-        
-        client = CURCLLMClient()
+        self.mock_httpx.return_value.get.side_effect = httpx.TimeoutException("Timeout")
         
         with pytest.raises(httpx.TimeoutException):
-            client.health_check()
+            self.client.health_check()
     
-    @patch('src.client.curc_llm_client.httpx.Client')
-    def test_connection_error(self, mock_httpx):
+    def test_connection_error(self):
         """Test handling of connection error."""
         import httpx
-        mock_httpx.return_value.get.side_effect = httpx.ConnectError("Cannot connect")
-        
-        client = CURCLLMClient()
+        self.mock_httpx.return_value.get.side_effect = httpx.ConnectError("Cannot connect")
         
         with pytest.raises(httpx.ConnectError):
-            client.health_check()
+            self.client.health_check()
     
-    @patch('src.client.curc_llm_client.httpx.Client')
-    def test_http_error_response(self, mock_httpx):
+    def test_http_error_response(self):
         """Test handling of HTTP error responses."""
         import httpx
         mock_response = Mock()
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             "500 Server Error", request=Mock(), response=Mock()
         )
-        mock_httpx.return_value.get.return_value = mock_response
-        
-        client = CURCLLMClient()
+        self.mock_httpx.return_value.get.return_value = mock_response
         
         with pytest.raises(httpx.HTTPStatusError):
-            client.health_check()
+            self.client.health_check()
     
     def test_malformed_response(self):
         """Test handling of malformed JSON response from get_models."""
-        with patch('src.client.curc_llm_client.httpx.Client') as mock_httpx:
-            mock_response = Mock()
-            mock_response.json.side_effect = ValueError("Invalid JSON")
-            mock_httpx.return_value.get.return_value = mock_response
-
-            client = CURCLLMClient()
-
-            with pytest.raises(ValueError):
-                client.get_models()
+        mock_response = Mock()
+        mock_response.content = b"<html>Bad Gateway</html>"
+        mock_response.json.side_effect = ValueError("Invalid JSON")
+        self.mock_httpx.return_value.get.return_value = mock_response
+        
+        with pytest.raises(ValueError):
+            self.client.get_models()
 
 
 class TestEdgeCases:
@@ -176,13 +153,11 @@ class TestEdgeCases:
         assert client1.base_url == client2.base_url
         assert client1 is not client2
     
-    def test_client_close_multiple_times(self):
+    def test_client_close_multiple_times(self, mock_client):
         """Test closing client multiple times doesn't error."""
-        client = CURCLLMClient()
-        
         # Should not raise error
-        client.close()
-        client.close()
+        mock_client.close()
+        mock_client.close()
     
     def test_context_manager_with_exception(self):
         """Test context manager properly closes on exception."""
@@ -192,6 +167,7 @@ class TestEdgeCases:
             
             try:
                 with CURCLLMClient() as client:
+                    client.health_check()
                     raise ValueError("Test error")
             except ValueError:
                 pass
@@ -199,32 +175,24 @@ class TestEdgeCases:
             # Client should still be closed
             mock_client.close.assert_called_once()
     
-    def test_streaming_empty_response(self):
+    def test_streaming_empty_response(self, mock_client):
         """Test streaming with completely empty response."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_chunks = [
-                Mock(choices=[Mock(delta=Mock(content=None))]),
-                Mock(choices=[Mock(delta=Mock(content=None))]),
-            ]
-            mock_create.return_value = iter(mock_chunks)
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = (
+                NS(choices=[NS(delta=NS(content=None))]) for _ in range(2)
+            )
             
-            chunks = list(client.chat_stream("Test"))
+            chunks = list(mock_client.chat_stream("Test"))
             assert chunks == []
     
-    def test_completion_streaming_empty_response(self):
+    def test_completion_streaming_empty_response(self, mock_client):
         """Test completion streaming with completely empty response."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.completions, 'create') as mock_create:
-            mock_chunks = [
-                Mock(choices=[Mock(text=None)]),
-                Mock(choices=[Mock(text=None)]),
-            ]
-            mock_create.return_value = iter(mock_chunks)
+        with patch.object(mock_client.openai_client.completions, 'create') as mock_create:
+            mock_create.return_value = (
+                NS(choices=[NS(text=None)]) for _ in range(2)
+            )
             
-            chunks = list(client.complete_stream("Test"))
+            chunks = list(mock_client.complete_stream("Test"))
             assert chunks == []
     
     def test_base_url_with_multiple_slashes(self):
@@ -233,67 +201,47 @@ class TestEdgeCases:
         # Should strip all trailing slashes
         assert not client.base_url.endswith('/')
     
-    def test_custom_timeout_values(self):
-        """Test various timeout configurations."""
-        # Very short timeout
-        client1 = CURCLLMClient(timeout=0.1)
-        assert client1.timeout == 0.1
-        
-        # Very long timeout
-        client2 = CURCLLMClient(timeout=3600.0)
-        assert client2.timeout == 3600.0
-        
-        # Zero timeout (no timeout)
-        client3 = CURCLLMClient(timeout=0)
-        assert client3.timeout == 0
+    @pytest.mark.parametrize("timeout", [0.1, 3600.0, 0])
+    def test_custom_timeout_values(self, timeout):
+        """Test very short, very long and zero (no) timeouts."""
+        client = CURCLLMClient(timeout=timeout)
+        assert client.timeout == timeout
     
-    def test_custom_retry_values(self):
-        """Test various retry configurations."""
-        # No retries
-        client1 = CURCLLMClient(max_retries=0)
-        assert client1.max_retries == 0
-        
-        # Many retries
-        client2 = CURCLLMClient(max_retries=10)
-        assert client2.max_retries == 10
+    @pytest.mark.parametrize("max_retries", [0, 10])
+    def test_custom_retry_values(self, max_retries):
+        """Test no retries and many retries."""
+        client = CURCLLMClient(max_retries=max_retries)
+        assert client.max_retries == max_retries
 
 
 class TestConcurrency:
     """Test concurrent usage scenarios."""
     
-    def test_multiple_requests_same_client(self):
+    def test_multiple_requests_same_client(self, mock_client):
         """Test multiple sequential requests on same client."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_create:
-            mock_response = Mock()
-            mock_response.choices = [Mock(message=Mock(content="Response"))]
-            mock_create.return_value = mock_response
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_create:
+            mock_create.return_value = _chat_response("Response")
             
-            # Multiple requests
-            for i in range(10):
-                response = client.chat(f"Message {i}")
-                assert response == "Response"
+            results = list(map(mock_client.chat, _MSGS))
             
-            assert mock_create.call_count == 10
+            assert results == ["Response"] * len(_MSGS)
+            assert mock_create.call_count == len(_MSGS)
     
-    def test_alternating_chat_and_complete(self):
+    def test_alternating_chat_and_complete(self, mock_client):
         """Test alternating between chat and completion."""
-        client = CURCLLMClient()
-        
-        with patch.object(client.openai_client.chat.completions, 'create') as mock_chat, \
-             patch.object(client.openai_client.completions, 'create') as mock_complete:
+        with patch.object(mock_client.openai_client.chat.completions, 'create') as mock_chat, \
+             patch.object(mock_client.openai_client.completions, 'create') as mock_complete:
             
-            mock_chat.return_value = Mock(choices=[Mock(message=Mock(content="Chat"))])
-            mock_complete.return_value = Mock(choices=[Mock(text="Complete")])
+            mock_chat.return_value = _chat_response("Chat")
+            mock_complete.return_value = NS(choices=[NS(text="Complete")])
             
-            response1 = client.chat("Test")
+            response1 = mock_client.chat("Test")
             assert response1 == "Chat"
             
-            response2 = client.complete("Test")
+            response2 = mock_client.complete("Test")
             assert response2 == "Complete"
             
-            response3 = client.chat("Test")
+            response3 = mock_client.chat("Test")
             assert response3 == "Chat"
 
 